@@ -1,7 +1,17 @@
+import functools
 import os
+import sys
 from pathlib import Path
-from urllib.request import urlretrieve
-import zipfile
+
+from .install import download_archive, extract_archive
+
+_PLATFORM = sys.platform
+_BUN_EXECUTABLES = {
+    "linux": "bun",
+    "darwin": "bun",
+    "win32": "bun.exe",
+}
+_BUN_EXEC = _BUN_EXECUTABLES.get(_PLATFORM)
 
 
 def get_os_name() -> str:
@@ -9,7 +19,7 @@ def get_os_name() -> str:
 
 
 def get_os_platform() -> str:
-    return os.sys.platform
+    return _PLATFORM
 
 
 def install_bun() -> None:
@@ -19,14 +29,16 @@ def install_bun() -> None:
     download_bun()
 
 
+@functools.cache
+def _bun_path() -> Path | None:
+    if _BUN_EXEC is None:
+        return None
+    return Path.cwd() / "bin" / "bun" / _BUN_EXEC
+
+
 def find_bun() -> str | None:
-    path = Path.cwd() / "bin" / "bun"
-    match get_os_platform():
-        case "linux" | "darwin":
-            exec = path / "bun"
-        case "win32":
-            exec = path / "bun.exe"
-    if exec.exists():
+    exec = _bun_path()
+    if exec is not None and exec.exists():
         return str(exec)
     return None
 
@@ -39,10 +51,12 @@ BUN_RESOURCES = {
 
 
 def download_bun() -> None:
-    match get_os_platform():
+    match _PLATFORM:
         case "win32":
             url = BUN_RESOURCES["win32"]
             dest = Path.cwd() / "bin"
-            file, _ = urlretrieve(url)
-            zip = zipfile.ZipFile(file)
-            zip.extractall(dest)
+            file = download_archive(url)
+            try:
+                extract_archive(file, dest)
+            finally:
+                file.unlink()
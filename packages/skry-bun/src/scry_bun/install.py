@@ -1,8 +1,13 @@
-
 import os
-from pathlib import Path
-from urllib.request import urlretrieve
+import shutil
+import sys
 import zipfile
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from urllib.request import urlopen
+
+_PLATFORM = sys.platform
+_COPY_BUFFER_SIZE = 1 << 20
 
 
 def get_os_name() -> str:
@@ -10,7 +15,7 @@ def get_os_name() -> str:
 
 
 def get_os_platform() -> str:
-    return os.sys.platform
+    return _PLATFORM
 
 
 def install_bun() -> None:
@@ -21,14 +26,14 @@ def install_bun() -> None:
 
 
 def find_bun() -> str | None:
-    exec = BUN_EXECUTABLES.get(get_os_platform())
+    exec = _bun_path()
     if exec is not None and exec.exists():
         return str(exec)
     return None
 
 
 def get_executable_path(auto_install: bool = False) -> Path | None:
-    exec = BUN_EXECUTABLES.get(get_os_platform())
+    exec = _bun_path()
     if exec is not None and exec.exists():
         return exec
     if auto_install:
@@ -39,11 +44,20 @@ def get_executable_path(auto_install: bool = False) -> Path | None:
 
 
 BUN_EXECUTABLES = {
-    "darwin": Path.cwd() / "bin" / "bun-darwin-aarch64",
-    "linux": "bun",
-    "win32": Path.cwd() / "bin" / "bun-windows-x64/bun.exe",
+    "darwin": Path("bin") / "bun-darwin-aarch64",
+    "linux": Path("bun"),
+    "win32": Path("bin") / "bun-windows-x64/bun.exe",
 }
 
+_BUN_EXEC = BUN_EXECUTABLES.get(_PLATFORM)
+
+
+def _bun_path() -> Path | None:
+    if _BUN_EXEC is None:
+        return None
+    return Path.cwd() / _BUN_EXEC
+
+
 BUN_RESOURCES = {
     "darwin": "https://github.com/oven-sh/bun/releases/latest/download/bun-darwin-aarch64.zip",
     "linux": "",
@@ -52,10 +66,46 @@ BUN_RESOURCES = {
 
 
 def download_bun() -> None:
-    match get_os_platform():
+    match _PLATFORM:
         case "win32":
             url = BUN_RESOURCES["win32"]
             dest = Path.cwd() / "bin"
-            file, _ = urlretrieve(url)
-            zip = zipfile.ZipFile(file)
-            zip.extractall(dest)
+            file = download_archive(url)
+            try:
+                extract_archive(file, dest)
+            finally:
+                file.unlink()
+
+
+def download_archive(url: str) -> Path:
+    with urlopen(url) as response, NamedTemporaryFile(delete=False) as tmp:
+        path = Path(tmp.name)
+        try:
+            shutil.copyfileobj(response, tmp, _COPY_BUFFER_SIZE)
+        except BaseException:
+            tmp.close()
+            path.unlink()
+            raise
+    return path
+
+
+def _extract_member(
+    archive: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    dest: Path,
+) -> None:
+    target = (dest / member.filename).resolve()
+    if not target.is_relative_to(dest.resolve()):
+        raise ValueError(f"Archive member escapes destination: {member.filename}")
+    if member.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with archive.open(member) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
+
+
+def extract_archive(file: str | Path, dest: Path) -> None:
+    with zipfile.ZipFile(file) as archive:
+        for member in archive.infolist():
+            _extract_member(archive, member, dest)
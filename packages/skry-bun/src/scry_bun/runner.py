@@ -1,10 +1,13 @@
 import subprocess
 from pathlib import Path
-from bun.install import get_executable_path
 
+from .install import get_executable_path
 
-def build_quasar():
-    wd = Path().cwd() / "quasar"
+
+def build_quasar() -> None:
+    wd = Path.cwd() / "quasar"
     bun = get_executable_path()
+    if bun is None:
+        raise FileNotFoundError("bun executable not found")
 
-    print(subprocess.run([bun, "run","build"], cwd=wd, check=True))
+    subprocess.run([str(bun), "run", "build"], cwd=wd, check=True, close_fds=False)
@@ -0,0 +1,71 @@
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from scry_bun import install
+
+
+def test_bun_path_follows_current_directory(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(install, "_BUN_EXEC", Path("bun"))
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    (second / "bun").touch()
+
+    monkeypatch.chdir(first)
+    assert install.find_bun() is None
+
+    monkeypatch.chdir(second)
+    assert install.find_bun() == str(second / "bun")
+    assert install.get_executable_path() == second / "bun"
+
+
+def test_extract_archive_writes_members(tmp_path) -> None:
+    archive = tmp_path / "bun.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("bun-windows-x64/", "")
+        zf.writestr("bun-windows-x64/bun.exe", b"binary")
+
+    install.extract_archive(archive, tmp_path / "bin")
+
+    assert (tmp_path / "bin" / "bun-windows-x64" / "bun.exe").read_bytes() == b"binary"
+
+
+def test_extract_archive_rejects_members_outside_destination(tmp_path) -> None:
+    archive = tmp_path / "evil.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("../escaped.txt", b"nope")
+
+    with pytest.raises(ValueError, match="escapes destination"):
+        install.extract_archive(archive, tmp_path / "bin")
+
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+def test_download_archive_copies_response(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(install, "urlopen", lambda url: io.BytesIO(b"archive"))
+
+    path = install.download_archive("https://example.invalid/bun.zip")
+
+    assert path.parent == tmp_path
+    assert path.read_bytes() == b"archive"
+
+
+def test_download_archive_removes_partial_file_on_failure(
+    monkeypatch, tmp_path
+) -> None:
+    class BrokenResponse(io.BytesIO):
+        def read(self, size: int | None = -1) -> bytes:
+            raise ConnectionResetError("connection reset")
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(install, "urlopen", lambda url: BrokenResponse())
+
+    with pytest.raises(ConnectionResetError):
+        install.download_archive("https://example.invalid/bun.zip")
+
+    assert list(tmp_path.iterdir()) == []
@@ -2,6 +2,7 @@ from importlib.metadata import PackageNotFoundError, version
 
 from .container import Container, Lifetime
 from .exceptions import (
+    CircularDependencyError,
     DIError,
     ProviderAlreadyRegisteredError,
     ProviderNotFoundError,
@@ -17,6 +18,7 @@ from .integrations.starlette import (
     get_container_from_request,
     install_starlette,
     resolve_from_request,
+    resolve_scoped_fast,
 )
 
 try:
@@ -26,6 +28,7 @@ except PackageNotFoundError:
 
 __all__ = [
     "__version__",
+    "CircularDependencyError",
     "Container",
     "ContainerMiddleware",
     "DIError",
@@ -39,4 +42,5 @@ __all__ = [
     "install_fastapi",
     "install_starlette",
     "resolve_from_request",
+    "resolve_scoped_fast",
 ]
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
+import inspect
+import threading
 from collections.abc import Callable, Hashable, Iterator
 from contextlib import contextmanager
 from contextvars import ContextVar
-from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from typing import Annotated, Any, TypeVar, cast
 
 from typing_extensions import Doc
 
 from .exceptions import (
+    CircularDependencyError,
     ProviderAlreadyRegisteredError,
     ProviderNotFoundError,
     ScopeError,
 )
 
 T = TypeVar("T")
-ProviderFactory = Callable[[Callable[[Hashable], Any]], T]
+ProviderFactory = Callable[[Callable[[Hashable], Any]], T] | Callable[[], T]
+_ResolverFactory = Callable[[Callable[[Hashable], Any]], Any]
+_BoundFactory = Callable[[], Any]
+_Handler = Callable[[Hashable, _BoundFactory], Any]
+_Provider = tuple[_BoundFactory, _Handler]
+_MISSING = object()
 
 
 class Lifetime(str, Enum):
@@ -25,20 +33,32 @@ class Lifetime(str, Enum):
     SCOPED = "scoped"
 
 
-@dataclass(frozen=True)
-class _Provider:
-    factory: ProviderFactory[Any]
-    lifetime: Lifetime
-
-
 class Container:
+    __slots__ = (
+        "_factories",
+        "_handlers",
+        "_lock",
+        "_providers",
+        "_resolve",
+        "_scoped_cache",
+        "_singletons",
+    )
+
     def __init__(self) -> None:
         self._providers: dict[Hashable, _Provider] = {}
+        self._factories: dict[Hashable, _ResolverFactory] = {}
         self._singletons: dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
         self._scoped_cache: ContextVar[dict[Hashable, Any] | None] = ContextVar(
             "skry_di_scoped_cache",
             default=None,
         )
+        self._resolve = self.resolve
+        self._handlers: dict[Lifetime, _Handler] = {
+            Lifetime.TRANSIENT: self._resolve_transient,
+            Lifetime.SINGLETON: self._resolve_singleton,
+            Lifetime.SCOPED: self._resolve_scoped,
+        }
 
     def register(
         self,
@@ -57,41 +77,157 @@ class Container:
             Doc("Whether to replace an existing provider for this token."),
         ] = False,
     ) -> None:
-        if token in self._providers and not replace:
-            raise ProviderAlreadyRegisteredError(token)
-        self._providers[token] = _Provider(
-            factory=cast(ProviderFactory[Any], provider),
-            lifetime=lifetime,
-        )
+        handler = self._handlers[Lifetime(lifetime)]
+        takes_resolver = _takes_resolver(provider)
+        with self._lock:
+            if token in self._providers and not replace:
+                raise ProviderAlreadyRegisteredError(token)
+
+            if takes_resolver:
+                factory = cast(_ResolverFactory, provider)
+                self._factories[token] = factory
+                self._providers[token] = (partial(factory, self._resolve), handler)
+            else:
+                self._factories.pop(token, None)
+                self._providers[token] = (cast(_BoundFactory, provider), handler)
 
     def resolve(
         self,
         token: Annotated[Hashable, Doc("Lookup token for the desired dependency.")],
     ) -> Any:
-        provider = self._providers.get(token)
-        if provider is None:
-            raise ProviderNotFoundError(token)
+        try:
+            factory, handler = self._providers[token]
+        except KeyError:
+            raise ProviderNotFoundError(token) from None
 
-        if provider.lifetime is Lifetime.TRANSIENT:
-            return provider.factory(self.resolve)
+        return handler(token, factory)
 
-        if provider.lifetime is Lifetime.SINGLETON:
-            if token not in self._singletons:
-                self._singletons[token] = provider.factory(self.resolve)
-            return self._singletons[token]
+    def _resolve_transient(
+        self,
+        _token: Hashable,
+        factory: _BoundFactory,
+    ) -> Any:
+        return factory()
 
+    def _resolve_singleton(
+        self,
+        token: Hashable,
+        factory: _BoundFactory,
+    ) -> Any:
+        try:
+            return self._singletons[token]
+        except KeyError:
+            pass
+
+        with self._lock:
+            try:
+                return self._singletons[token]
+            except KeyError:
+                instance = factory()
+                self._singletons[token] = instance
+                return instance
+
+    def _resolve_scoped(
+        self,
+        token: Hashable,
+        factory: _BoundFactory,
+    ) -> Any:
         scoped_cache = self._scoped_cache.get()
         if scoped_cache is None:
             raise ScopeError("No active DI scope. Use `with container.scope():`.")
 
-        if token not in scoped_cache:
-            scoped_cache[token] = provider.factory(self.resolve)
-        return scoped_cache[token]
+        if scoped_cache:
+            try:
+                return scoped_cache[token]
+            except KeyError:
+                pass
+
+        instance = factory()
+        scoped_cache[token] = instance
+        return instance
+
+    def seal(self) -> None:
+        resolving: list[Hashable] = []
+        providers = self._providers
+        factories = self._factories
+        singletons = self._singletons
+        resolve_transient = self._resolve_transient
+        resolve_singleton = self._resolve_singleton
+
+        def tracing_resolve(token: Hashable) -> Any:
+            if token in resolving:
+                cycle = resolving[resolving.index(token) :]
+                raise CircularDependencyError([*cycle, token])
+
+            try:
+                factory, handler = providers[token]
+            except KeyError:
+                raise ProviderNotFoundError(token) from None
+
+            traced = factories.get(token)
+            if traced is not None:
+                factory = partial(traced, tracing_resolve)
+
+            resolving.append(token)
+            try:
+                if handler == resolve_transient:
+                    return factory()
+                if handler == resolve_singleton:
+                    try:
+                        return singletons[token]
+                    except KeyError:
+                        instance = factory()
+                        singletons[token] = instance
+                        return instance
+                return handler(token, factory)
+            finally:
+                resolving.pop()
+
+        with self._lock:
+            for token, (_factory, handler) in list(providers.items()):
+                if handler == resolve_singleton:
+                    tracing_resolve(token)
+
+    def compile(self) -> Callable[[Hashable], Any]:
+        plans: dict[Hashable, _BoundFactory] = {}
+
+        def resolve(token: Hashable) -> Any:
+            instance = instances.get(token, _MISSING)
+            if instance is not _MISSING:
+                return instance
+            try:
+                plan = plans[token]
+            except KeyError:
+                raise ProviderNotFoundError(token) from None
+            return plan()
+
+        with self._lock:
+            instances = dict(self._singletons)
+            for token, (factory, handler) in self._providers.items():
+                if token in instances:
+                    continue
+                original = self._factories.get(token)
+                if original is not None:
+                    factory = partial(original, resolve)
+                if handler == self._resolve_transient:
+                    plans[token] = factory
+                else:
+                    plans[token] = partial(handler, token, factory)
+
+        return resolve
 
     @contextmanager
-    def scope(self) -> Iterator[None]:
-        scope_token = self._scoped_cache.set({})
+    def scope(self) -> Iterator[dict[Hashable, Any]]:
+        scoped_cache: dict[Hashable, Any] = {}
+        scope_token = self._scoped_cache.set(scoped_cache)
         try:
-            yield
+            yield scoped_cache
         finally:
             self._scoped_cache.reset(scope_token)
+
+
+def _takes_resolver(provider: Callable[..., Any]) -> bool:
+    try:
+        return bool(inspect.signature(provider).parameters)
+    except (TypeError, ValueError):
+        return True
@@ -17,6 +17,12 @@ class ProviderAlreadyRegisteredError(DIError):
         super().__init__(f"Provider already registered for token: {token!r}")
 
 
+class CircularDependencyError(DIError):
+    def __init__(self, tokens: Any) -> None:
+        path = " -> ".join(repr(token) for token in tokens)
+        super().__init__(f"Circular dependency detected: {path}")
+
+
 class ScopeError(DIError):
     """Raised when scoped resolution is used without an active scope."""
 
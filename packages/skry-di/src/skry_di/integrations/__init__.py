@@ -4,6 +4,7 @@ from .starlette import (
     get_container_from_request,
     install_starlette,
     resolve_from_request,
+    resolve_scoped_fast,
 )
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "install_fastapi",
     "install_starlette",
     "resolve_from_request",
+    "resolve_scoped_fast",
 ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from collections.abc import Awaitable, Callable
 from typing import Annotated, Any, TypeVar, cast
 
@@ -35,6 +36,7 @@ def install_fastapi(
         return JSONResponse(status_code=500, content={"detail": str(exception)})
 
 
+@functools.cache
 def from_container(
     token: Annotated[Any, Doc("Token to resolve from the request container.")],
 ) -> Callable[[Request], Awaitable[T]]:
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Annotated, Any, TypeVar
+from operator import attrgetter
+from typing import Annotated, Any, TypeVar, cast
 
 from starlette.applications import Starlette
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 from typing_extensions import Doc
 
 from skry_di.container import Container
@@ -12,24 +13,34 @@ from skry_di.exceptions import ScopeError
 
 T = TypeVar("T")
 _CONTAINER_STATE_KEY = "di_container"
+_SCOPE_STATE_KEY = "di_scope"
+_MISSING = object()
+_get_container = attrgetter(f"app.state.{_CONTAINER_STATE_KEY}")
 
 
-class ContainerMiddleware(BaseHTTPMiddleware):
+class ContainerMiddleware:
+    __slots__ = ("_container", "app")
+
     def __init__(
         self,
-        app: Any,
+        app: ASGIApp,
         *,
         container: Annotated[
             Container,
             Doc("Container used for request-scoped dependency resolution."),
         ],
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self._container = container
 
-    async def dispatch(self, request: Request, call_next: Any) -> Any:
-        with self._container.scope():
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        with self._container.scope() as scoped_cache:
+            scope.setdefault("state", {})[_SCOPE_STATE_KEY] = scoped_cache
+            await self.app(scope, receive, send)
 
 
 def install_starlette(
@@ -46,15 +57,29 @@ def install_starlette(
 def get_container_from_request(
     request: Annotated[Request, Doc("Current Starlette request object.")],
 ) -> Container:
-    container = getattr(request.app.state, _CONTAINER_STATE_KEY, None)
-    if not isinstance(container, Container):
-        raise ScopeError("Container is not attached to the request application.")
-    return container
+    try:
+        return cast(Container, _get_container(request))
+    except AttributeError:
+        raise ScopeError(
+            "Container is not attached to the request application."
+        ) from None
 
 
-def resolve_from_request(
+def resolve_scoped_fast(
     request: Annotated[Request, Doc("Current Starlette request object.")],
     token: Annotated[Any, Doc("Token to resolve from the attached container.")],
 ) -> Any:
+    scoped_cache = getattr(request.state, _SCOPE_STATE_KEY, None)
+    if scoped_cache is not None:
+        instance = scoped_cache.get(token, _MISSING)
+        if instance is not _MISSING:
+            return instance
     return get_container_from_request(request).resolve(token)
 
+
+def resolve_from_request(
+    request: Annotated[Request, Doc("Current Starlette request object.")],
+    token: Annotated[Any, Doc("Token to resolve from the attached container.")],
+) -> Any:
+    return resolve_scoped_fast(request, token)
+
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import threading
+import time
+
 import pytest
 from skry_di import (
+    CircularDependencyError,
     Container,
     Lifetime,
     ProviderAlreadyRegisteredError,
@@ -188,3 +192,126 @@ def test_nested_dependency_tree_missing_leaf_provider_raises() -> None:
 
     with pytest.raises(ProviderNotFoundError):
         container.resolve(UseCase)
+
+
+def test_register_accepts_lifetime_value() -> None:
+    container = Container()
+    container.register(Service, lambda _resolver: Service(), lifetime="singleton")
+
+    assert container.resolve(Service) is container.resolve(Service)
+
+
+def test_seal_builds_singletons_eagerly() -> None:
+    built: list[type] = []
+
+    def build_service(_resolve: object) -> Service:
+        built.append(Service)
+        return Service()
+
+    container = Container()
+    container.register(Service, build_service, lifetime=Lifetime.SINGLETON)
+    container.register(
+        Repository,
+        lambda resolve: Repository(resolve(Service)),
+        lifetime=Lifetime.SINGLETON,
+    )
+
+    container.seal()
+
+    assert built == [Service]
+    repository = container.resolve(Repository)
+    assert repository.service is container.resolve(Service)
+    assert built == [Service]
+
+
+def test_seal_detects_circular_dependencies() -> None:
+    container = Container()
+    container.register(
+        Service,
+        lambda resolve: resolve(Repository),
+        lifetime=Lifetime.SINGLETON,
+    )
+    container.register(
+        Repository,
+        lambda resolve: Repository(resolve(Service)),
+        lifetime=Lifetime.SINGLETON,
+    )
+
+    with pytest.raises(CircularDependencyError):
+        container.seal()
+
+
+def test_register_accepts_factory_without_resolver() -> None:
+    container = Container()
+    container.register(Service, Service, lifetime=Lifetime.SINGLETON)
+    container.register(
+        Repository,
+        lambda resolve: Repository(resolve(Service)),
+        lifetime=Lifetime.TRANSIENT,
+    )
+
+    assert container.resolve(Repository).service is container.resolve(Service)
+
+
+def test_compile_serves_sealed_singletons_and_falls_back() -> None:
+    container = Container()
+    container.register(Service, Service, lifetime=Lifetime.SINGLETON)
+    container.register(
+        Repository,
+        lambda resolve: Repository(resolve(Service)),
+        lifetime=Lifetime.TRANSIENT,
+    )
+    container.seal()
+
+    resolve = container.compile()
+
+    assert resolve(Service) is container.resolve(Service)
+    assert resolve(Repository) is not resolve(Repository)
+    assert resolve(Repository).service is resolve(Service)
+    with pytest.raises(ProviderNotFoundError):
+        resolve(UseCase)
+
+
+def test_singleton_factory_runs_once_across_threads() -> None:
+    calls: list[int] = []
+
+    def build_service() -> Service:
+        calls.append(1)
+        time.sleep(0.01)
+        return Service()
+
+    container = Container()
+    container.register(Service, build_service, lifetime=Lifetime.SINGLETON)
+    results: list[Service] = []
+
+    def worker() -> None:
+        results.append(container.resolve(Service))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_compile_plans_scoped_and_unbuilt_singletons() -> None:
+    container = Container()
+    container.register(Service, Service, lifetime=Lifetime.SINGLETON)
+    container.register(
+        Repository,
+        lambda resolve: Repository(resolve(Service)),
+        lifetime=Lifetime.SCOPED,
+    )
+
+    resolve = container.compile()
+
+    with container.scope():
+        first = resolve(Repository)
+        assert resolve(Repository) is first
+        assert first.service is container.resolve(Service)
+
+    with pytest.raises(ScopeError):
+        resolve(Repository)
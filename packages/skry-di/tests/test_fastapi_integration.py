@@ -59,3 +59,8 @@ def test_fastapi_integration_missing_provider_reports_token() -> None:
 
     assert response.status_code == 500
     assert "MissingService" in response.json()["detail"]
+
+
+def test_from_container_reuses_dependency_per_token() -> None:
+    assert from_container(RequestService) is from_container(RequestService)
+    assert from_container(RequestService) is not from_container(MissingService)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from skry_di import Container, Lifetime
-from skry_di.integrations.starlette import install_starlette, resolve_from_request
+import pytest
+from skry_di import Container, Lifetime, ScopeError
+from skry_di.integrations.starlette import (
+    get_container_from_request,
+    install_starlette,
+    resolve_from_request,
+)
 from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -37,3 +42,37 @@ def test_starlette_request_scope_isolation() -> None:
     assert first["same"] is True
     assert second["same"] is True
     assert first["id"] != second["id"]
+
+
+def test_starlette_request_state_exposes_scope_cache() -> None:
+    container = Container()
+    container.register(
+        RequestService,
+        lambda _resolver: RequestService(),
+        lifetime=Lifetime.SCOPED,
+    )
+
+    async def handler(request: Request) -> JSONResponse:
+        service = resolve_from_request(request, RequestService)
+        cached = request.state.di_scope[RequestService]
+        return JSONResponse({"cached": cached is service})
+
+    app = Starlette(routes=[Route("/", handler)])
+    install_starlette(app, container)
+
+    with TestClient(app) as client:
+        response = client.get("/").json()
+
+    assert response["cached"] is True
+
+
+def test_starlette_missing_container_raises_scope_error() -> None:
+    async def handler(request: Request) -> JSONResponse:
+        with pytest.raises(ScopeError):
+            get_container_from_request(request)
+        return JSONResponse({})
+
+    app = Starlette(routes=[Route("/", handler)])
+
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
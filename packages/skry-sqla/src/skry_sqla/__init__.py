@@ -27,6 +27,7 @@ from .filters import (
     NotIn,
     Or,
     StartsWith,
+    apply_all,
 )
 from .model import (
     M_ID,
@@ -89,6 +90,7 @@ __all__ = [
     "JsonHasKey",
     "ArrayContains",
     "ArrayOverlap",
+    "apply_all",
     "apply_options",
     "TimestampableMixin",
     "TimestamableMixin",
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+from collections.abc import AsyncIterator, Mapping, Sequence
 from typing import Any, List, TypeVar
 
 from sqlalchemy import Result, insert
@@ -12,6 +12,8 @@ from sqlalchemy.sql import Executable
 from .exceptions import PersistenceError
 
 DB = TypeVar("DB", bound=DeclarativeBase)
+_MAX_BIND_PARAMS = 32000
+_DEFAULT_RETURNING = ("id",)
 
 
 class AsyncEntityManager:
@@ -21,7 +23,15 @@ class AsyncEntityManager:
     async def execute_query(self, statement: Executable) -> Result[Any]:
         return await self.session.execute(statement)
 
-    async def get_one_or_none(self, statement: Executable) -> DB | None:
+    async def get(
+        self,
+        model: type[DB],
+        ident: Any,
+        options: Sequence[Any] | None = None,
+    ) -> DB | None:
+        return await self.session.get(model, ident, options=options)
+
+    async def get_one_or_none(self, statement: Executable) -> Any:
         result = await self.execute_query(statement)
         return result.unique().scalar_one_or_none()
 
@@ -29,6 +39,15 @@ class AsyncEntityManager:
         result = await self.execute_query(statement)
         return list(result.scalars().all())
 
+    async def stream(
+        self, statement: Executable, batch_size: int = 1000
+    ) -> AsyncIterator[List[Any]]:
+        result = await self.session.stream(
+            statement.execution_options(yield_per=batch_size)
+        )
+        async for partition in result.scalars().partitions():
+            yield list(partition)
+
     async def delete(self, entity: DB) -> None:
         await self.session.delete(entity)
         try:
@@ -53,12 +72,19 @@ class AsyncEntityManager:
         values: Sequence[Mapping[str, Any]],
         returning: Sequence[str] | None = None,
     ) -> List[dict[str, Any]]:
-        returning_fields = list(returning or ["id"])
+        returning_fields = returning or _DEFAULT_RETURNING
         stmt = insert(model).returning(*[getattr(model, f) for f in returning_fields])
+        columns = len(values[0]) if values else 1
+        chunk_size = max(1, _MAX_BIND_PARAMS // max(1, columns))
         try:
-            result = await self.session.execute(stmt, values)
+            rows: List[dict[str, Any]] = []
+            for start in range(0, len(values), chunk_size):
+                result = await self.session.execute(
+                    stmt, values[start : start + chunk_size]
+                )
+                rows.extend(dict(row) for row in result.mappings().all())
             await self.session.commit()
-            return [dict(row) for row in result.mappings().all()]
+            return rows
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise PersistenceError("Failed to insert entities in bulk") from e
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import Any, Protocol
+import operator
+from collections.abc import Iterable, Sequence
+from typing import Any, ClassVar, Protocol, Self
 
 from sqlalchemy import and_, not_, or_
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.sql import Select
 
+_MISSING = object()
+_FIELD_CACHE: dict[tuple[type[DeclarativeBase], str], Any] = {}
+
 
 def _get_field(model: type[DeclarativeBase], field: str) -> Any:
-    if not hasattr(model, field):
+    key = (model, field)
+    try:
+        return _FIELD_CACHE[key]
+    except KeyError:
+        pass
+
+    attr = getattr(model, field, _MISSING)
+    if attr is _MISSING:
         raise ValueError(f"Unknown field '{field}'")
-    return getattr(model, field)
+    _FIELD_CACHE[key] = attr
+    return attr
 
 
 class Filter(Protocol):
@@ -19,218 +31,281 @@ class Filter(Protocol):
 
 
 class ClauseFilter:
+    __slots__ = ("_bound_model", "_clause")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_bound_model", None)
+            object.__setattr__(self, "_clause", None)
+
+    def bind(self, model: type[DeclarativeBase]) -> Self:
+        if type(self)._build_clause is ClauseFilter._build_clause:
+            clause = self.to_clause(model)
+        else:
+            clause = self._build_clause(model)
+        self._clause = clause
+        self._bound_model = model
+        return self
+
     def to_clause(self, model: type[DeclarativeBase]) -> Any:
+        if getattr(self, "_bound_model", None) is model:
+            return self._clause
+        return self._build_clause(model)
+
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
         raise NotImplementedError
 
     def apply(self, stmt: Select[Any], model: type[DeclarativeBase]) -> Select[Any]:
         return stmt.where(self.to_clause(model))
 
 
-class Equal(ClauseFilter):
+class _ValueFilter(ClauseFilter):
+    __slots__ = ("field", "value")
+
+    _operator: ClassVar[staticmethod[[Any, Any], Any]]
+
     def __init__(self, field: str, value: Any) -> None:
         self.field = field
         self.value = value
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field) == self.value
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        return self._operator(_get_field(model, self.field), self.value)
 
 
-class In(ClauseFilter):
+class _ValuesFilter(ClauseFilter):
+    __slots__ = ("field", "values")
+
+    _operator: ClassVar[staticmethod[[Any, list[Any]], Any]]
+
     def __init__(self, field: str, values: list[Any]) -> None:
         self.field = field
         self.values = values
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).in_(self.values)
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        return self._operator(_get_field(model, self.field), self.values)
 
 
-class Like(ClauseFilter):
+class _PatternFilter(ClauseFilter):
+    __slots__ = ("field", "pattern")
+
+    _operator: ClassVar[staticmethod[[Any, str], Any]]
+
     def __init__(self, field: str, pattern: str) -> None:
         self.field = field
         self.pattern = pattern
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).like(self.pattern)
-
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        return self._operator(_get_field(model, self.field), self.pattern)
 
-class NotEqual(ClauseFilter):
-    def __init__(self, field: str, value: Any) -> None:
-        self.field = field
-        self.value = value
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field) != self.value
+class _FieldFilter(ClauseFilter):
+    __slots__ = ("field",)
 
+    _operator: ClassVar[staticmethod[[Any], Any]]
 
-class GreaterThan(ClauseFilter):
-    def __init__(self, field: str, value: Any) -> None:
+    def __init__(self, field: str) -> None:
         self.field = field
-        self.value = value
-
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field) > self.value
 
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        return self._operator(_get_field(model, self.field))
 
-class LessThan(ClauseFilter):
-    def __init__(self, field: str, value: Any) -> None:
-        self.field = field
-        self.value = value
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field) < self.value
+class Equal(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(operator.eq)
 
 
-class GreaterOrEqual(ClauseFilter):
-    def __init__(self, field: str, value: Any) -> None:
-        self.field = field
-        self.value = value
+class In(_ValuesFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, values: column.in_(values))
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field) >= self.value
 
+class Like(_PatternFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, pattern: column.like(pattern))
 
-class LessOrEqual(ClauseFilter):
-    def __init__(self, field: str, value: Any) -> None:
-        self.field = field
-        self.value = value
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field) <= self.value
+class NotEqual(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(operator.ne)
 
 
-class Between(ClauseFilter):
-    def __init__(self, field: str, start: Any, end: Any) -> None:
-        self.field = field
-        self.start = start
-        self.end = end
+class GreaterThan(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(operator.gt)
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).between(self.start, self.end)
 
+class LessThan(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(operator.lt)
 
-class IsNull(ClauseFilter):
-    def __init__(self, field: str) -> None:
-        self.field = field
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).is_(None)
+class GreaterOrEqual(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(operator.ge)
 
 
-class IsNotNull(ClauseFilter):
-    def __init__(self, field: str) -> None:
-        self.field = field
+class LessOrEqual(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(operator.le)
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).is_not(None)
 
+class Between(ClauseFilter):
+    __slots__ = ("field", "start", "end")
 
-class ILike(ClauseFilter):
-    def __init__(self, field: str, pattern: str) -> None:
+    def __init__(self, field: str, start: Any, end: Any) -> None:
         self.field = field
-        self.pattern = pattern
+        self.start = start
+        self.end = end
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).ilike(self.pattern)
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        return _get_field(model, self.field).between(self.start, self.end)
 
 
-class StartsWith(ClauseFilter):
-    def __init__(self, field: str, value: str) -> None:
-        self.field = field
-        self.value = value
+class IsNull(_FieldFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column: column.is_(None))
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).startswith(self.value)
 
+class IsNotNull(_FieldFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column: column.is_not(None))
 
-class EndsWith(ClauseFilter):
-    def __init__(self, field: str, value: str) -> None:
-        self.field = field
-        self.value = value
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).endswith(self.value)
+class ILike(_PatternFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, pattern: column.ilike(pattern))
 
 
-class Contains(ClauseFilter):
-    def __init__(self, field: str, value: str) -> None:
-        self.field = field
-        self.value = value
+class StartsWith(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, value: column.startswith(value))
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).contains(self.value)
 
+class EndsWith(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, value: column.endswith(value))
 
-class NotIn(ClauseFilter):
-    def __init__(self, field: str, values: list[Any]) -> None:
-        self.field = field
-        self.values = values
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).notin_(self.values)
+class Contains(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, value: column.contains(value))
 
 
-class JsonContains(ClauseFilter):
-    def __init__(self, field: str, value: Any) -> None:
-        self.field = field
-        self.value = value
+class NotIn(_ValuesFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, values: column.notin_(values))
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).contains(self.value)
+
+class JsonContains(_ValueFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, value: column.contains(value))
 
 
 class JsonHasKey(ClauseFilter):
+    __slots__ = ("field", "key")
+
     def __init__(self, field: str, key: str) -> None:
         self.field = field
         self.key = key
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
         return _get_field(model, self.field).has_key(self.key)
 
 
-class ArrayContains(ClauseFilter):
-    def __init__(self, field: str, values: list[Any]) -> None:
-        self.field = field
-        self.values = values
-
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).contains(self.values)
-
+class ArrayContains(_ValuesFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, values: column.contains(values))
 
-class ArrayOverlap(ClauseFilter):
-    def __init__(self, field: str, values: list[Any]) -> None:
-        self.field = field
-        self.values = values
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return _get_field(model, self.field).overlap(self.values)
+class ArrayOverlap(_ValuesFilter):
+    __slots__ = ()
+    _operator = staticmethod(lambda column, values: column.overlap(values))
 
 
 class And(ClauseFilter):
+    __slots__ = ("filters",)
+
     def __init__(self, filters: Sequence[ClauseFilter]) -> None:
-        self.filters = list(filters)
+        self.filters: list[ClauseFilter] = []
+        for item in filters:
+            if isinstance(item, And):
+                self.filters.extend(item.filters)
+            else:
+                self.filters.append(item)
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return and_(*[item.to_clause(model) for item in self.filters])
+    def bind(self, model: type[DeclarativeBase]) -> Self:
+        for item in self.filters:
+            item.bind(model)
+        return self
+
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        if len(self.filters) == 1:
+            return self.filters[0].to_clause(model)
+        return and_(*(item.to_clause(model) for item in self.filters))
 
 
 class Or(ClauseFilter):
+    __slots__ = ("filters",)
+
     def __init__(self, filters: Sequence[ClauseFilter]) -> None:
-        self.filters = list(filters)
+        self.filters: list[ClauseFilter] = []
+        for item in filters:
+            if isinstance(item, Or):
+                self.filters.extend(item.filters)
+            else:
+                self.filters.append(item)
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
-        return or_(*[item.to_clause(model) for item in self.filters])
+    def bind(self, model: type[DeclarativeBase]) -> Self:
+        for item in self.filters:
+            item.bind(model)
+        return self
+
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        if len(self.filters) == 1:
+            return self.filters[0].to_clause(model)
+        return or_(*(item.to_clause(model) for item in self.filters))
 
 
 class Not(ClauseFilter):
+    __slots__ = ("filter_item",)
+
     def __init__(self, filter_item: ClauseFilter) -> None:
         self.filter_item = filter_item
 
-    def to_clause(self, model: type[DeclarativeBase]) -> Any:
+    def bind(self, model: type[DeclarativeBase]) -> Self:
+        self.filter_item.bind(model)
+        return self
+
+    def _build_clause(self, model: type[DeclarativeBase]) -> Any:
+        if isinstance(self.filter_item, Not):
+            return self.filter_item.filter_item.to_clause(model)
         return not_(self.filter_item.to_clause(model))
 
 
+def apply_all(
+    stmt: Select[Any],
+    model: type[DeclarativeBase],
+    filters: Iterable[Filter] | None,
+) -> Select[Any]:
+    clauses: list[Any] = []
+    for item in filters or ():
+        if isinstance(item, ClauseFilter):
+            clauses.append(item.to_clause(model))
+            continue
+        if clauses:
+            stmt = stmt.where(*clauses)
+            clauses = []
+        stmt = item.apply(stmt, model)
+    if clauses:
+        stmt = stmt.where(*clauses)
+    return stmt
+
+
 __all__ = [
     "Filter",
+    "apply_all",
     "Equal",
     "In",
     "Like",
@@ -1,25 +1,42 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 from collections.abc import AsyncGenerator, Awaitable, Callable, Mapping
+from dataclasses import dataclass
 from importlib import import_module
-from typing import Any, cast
+from typing import Any
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import event
-from sqlalchemy.engine import Connection
+from sqlalchemy import MetaData, inspect, select, text, tuple_
+from sqlalchemy.engine import URL, Connection, Dialect
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
     AsyncSession,
+    async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from .model import Base
 
 ModelMapping = Mapping[str, Any]
 MigrationCallback = Callable[[AsyncConnection], Awaitable[None]]
 
+_TRUTHY = frozenset(("1", "true", "yes", "on"))
+_DDL_CACHE: dict[tuple[MetaData, str, tuple[str, ...]], tuple[str, ...]] = {}
+_SCHEMA_META_TABLE = "_skry_meta"
+
+
+@dataclass(frozen=True, slots=True)
+class _PluginConfig:
+    database_uri: str
+    use_migrations: bool
+    alembic_config_path: str | None
+    migration_target: str
+
 
 def pytest_addoption(parser: Any) -> None:
     group = parser.getgroup("skry-sqla")
@@ -116,28 +133,109 @@ def _resolve_bool_setting(
         return ini_value
     if ini_value in (None, ""):
         return default
-    return str(ini_value).strip().lower() in {"1", "true", "yes", "on"}
+    return str(ini_value).strip().lower() in _TRUTHY
 
 
-def _run_alembic_upgrade(
-    sync_connection: Connection,
-    alembic_config_path: str,
-    migration_target: str,
-) -> None:
+@functools.cache
+def _alembic_modules() -> tuple[Any, Any]:
     try:
-        command_module = cast(Any, import_module("alembic.command"))
-        config_module = cast(Any, import_module("alembic.config"))
+        command_module = import_module("alembic.command")
+        config_module = import_module("alembic.config")
     except ModuleNotFoundError as error:
         raise RuntimeError(
             "Alembic is required for migration mode. Install `alembic` or "
             "override sqla_migration_callback."
         ) from error
+    return command_module, config_module
+
 
+def _run_alembic_upgrade(
+    sync_connection: Connection,
+    alembic_config_path: str,
+    migration_target: str,
+) -> None:
+    command_module, config_module = _alembic_modules()
     config = config_module.Config(alembic_config_path)
     config.attributes["connection"] = sync_connection
     command_module.upgrade(config, migration_target)
 
 
+def _is_memory_database(url: URL) -> bool:
+    if url.get_backend_name() != "sqlite":
+        return False
+    database = url.database or ""
+    return (
+        database in ("", ":memory:")
+        or database.startswith("file::memory:")
+        or url.query.get("mode") == "memory"
+    )
+
+
+def _compiled_ddl(metadata: MetaData, dialect: Dialect) -> tuple[str, ...]:
+    key = (metadata, dialect.name, tuple(metadata.tables))
+    try:
+        return _DDL_CACHE[key]
+    except KeyError:
+        pass
+
+    statements: list[str] = []
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes
+        )
+    ddl = _DDL_CACHE[key] = tuple(statements)
+    return ddl
+
+
+def _has_create_listeners(metadata: MetaData) -> bool:
+    return any(
+        target.dispatch.before_create or target.dispatch.after_create
+        for target in (metadata, *metadata.tables.values())
+    )
+
+
+def _has_all_tables(sync_connection: Connection, metadata: MetaData) -> bool:
+    inspector = inspect(sync_connection)
+    existing: dict[str | None, set[str]] = {}
+    for table in metadata.tables.values():
+        if table.schema not in existing:
+            existing[table.schema] = set(inspector.get_table_names(schema=table.schema))
+        if table.name not in existing[table.schema]:
+            return False
+    return True
+
+
+def _schema_hash(metadata: MetaData, dialect: Dialect) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for statement in _compiled_ddl(metadata, dialect):
+        digest.update(statement.encode())
+    return digest.hexdigest()
+
+
+async def _create_all_stamped(connection: AsyncConnection, *, checkfirst: bool) -> None:
+    schema_hash = _schema_hash(Base.metadata, connection.engine.dialect)
+    await connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {_SCHEMA_META_TABLE} "
+            "(version VARCHAR(64) PRIMARY KEY)"
+        )
+    )
+    result = await connection.execute(text(f"SELECT version FROM {_SCHEMA_META_TABLE}"))
+    if schema_hash in result.scalars().all():
+        if await connection.run_sync(_has_all_tables, Base.metadata):
+            return
+        await connection.run_sync(Base.metadata.create_all, checkfirst=True)
+        return
+
+    await connection.run_sync(Base.metadata.create_all, checkfirst=checkfirst)
+    await connection.execute(text(f"DELETE FROM {_SCHEMA_META_TABLE}"))
+    await connection.execute(
+        text(f"INSERT INTO {_SCHEMA_META_TABLE} (version) VALUES (:version)"),
+        {"version": schema_hash},
+    )
+
+
 async def _initialize_schema(
     connection: AsyncConnection,
     *,
@@ -145,9 +243,28 @@ async def _initialize_schema(
     migration_callback: MigrationCallback | None,
     alembic_config_path: str | None,
     migration_target: str,
+    create_all_checkfirst: bool | None = None,
 ) -> None:
     if not use_migrations:
-        await connection.run_sync(Base.metadata.create_all)
+        persistent = not _is_memory_database(connection.engine.url)
+        if create_all_checkfirst is None:
+            create_all_checkfirst = persistent
+        if persistent:
+            await _create_all_stamped(connection, checkfirst=create_all_checkfirst)
+            return
+        dialect = connection.engine.dialect
+        if (
+            not create_all_checkfirst
+            and dialect.name == "sqlite"
+            and not _has_create_listeners(Base.metadata)
+        ):
+            for statement in _compiled_ddl(Base.metadata, dialect):
+                await connection.exec_driver_sql(statement)
+            return
+        await connection.run_sync(
+            Base.metadata.create_all,
+            checkfirst=create_all_checkfirst,
+        )
         return
 
     if migration_callback is not None:
@@ -170,45 +287,60 @@ async def _initialize_schema(
     )
 
 
-@pytest.fixture(scope="session")
-def sqla_test_database_uri(pytestconfig: pytest.Config) -> str:
-    return _resolve_string_setting(
+@functools.cache
+def _plugin_config(pytestconfig: pytest.Config) -> _PluginConfig:
+    alembic_config_path = _resolve_string_setting(
         pytestconfig=pytestconfig,
-        option_name="sqla_test_database_uri",
-        ini_name="sqla_test_database_uri",
-        default="sqlite+aiosqlite:///:memory:",
+        option_name="sqla_alembic_config_path",
+        ini_name="sqla_alembic_config_path",
+        default="",
+    )
+    return _PluginConfig(
+        database_uri=_resolve_string_setting(
+            pytestconfig=pytestconfig,
+            option_name="sqla_test_database_uri",
+            ini_name="sqla_test_database_uri",
+            default="sqlite+aiosqlite:///:memory:",
+        ),
+        use_migrations=_resolve_bool_setting(
+            pytestconfig=pytestconfig,
+            option_name="sqla_use_migrations",
+            ini_name="sqla_use_migrations",
+            default=False,
+        ),
+        alembic_config_path=alembic_config_path or None,
+        migration_target=_resolve_string_setting(
+            pytestconfig=pytestconfig,
+            option_name="sqla_migration_target",
+            ini_name="sqla_migration_target",
+            default="head",
+        ),
     )
 
 
+@pytest.fixture(scope="session")
+def sqla_test_database_uri(pytestconfig: pytest.Config) -> str:
+    return _plugin_config(pytestconfig).database_uri
+
+
 @pytest.fixture(scope="session")
 def sqla_use_migrations(pytestconfig: pytest.Config) -> bool:
-    return _resolve_bool_setting(
-        pytestconfig=pytestconfig,
-        option_name="sqla_use_migrations",
-        ini_name="sqla_use_migrations",
-        default=False,
-    )
+    return _plugin_config(pytestconfig).use_migrations
 
 
 @pytest.fixture(scope="session")
 def sqla_alembic_config_path(pytestconfig: pytest.Config) -> str | None:
-    value = _resolve_string_setting(
-        pytestconfig=pytestconfig,
-        option_name="sqla_alembic_config_path",
-        ini_name="sqla_alembic_config_path",
-        default="",
-    )
-    return value or None
+    return _plugin_config(pytestconfig).alembic_config_path
 
 
 @pytest.fixture(scope="session")
 def sqla_migration_target(pytestconfig: pytest.Config) -> str:
-    return _resolve_string_setting(
-        pytestconfig=pytestconfig,
-        option_name="sqla_migration_target",
-        ini_name="sqla_migration_target",
-        default="head",
-    )
+    return _plugin_config(pytestconfig).migration_target
+
+
+@pytest.fixture(scope="session")
+def sqla_create_all_checkfirst() -> bool | None:
+    return None
 
 
 @pytest.fixture(scope="session")
@@ -223,6 +355,7 @@ async def sqla_main_engine(
     sqla_migration_callback: MigrationCallback | None,
     sqla_alembic_config_path: str | None,
     sqla_migration_target: str,
+    sqla_create_all_checkfirst: bool | None,
 ) -> AsyncGenerator[AsyncEngine, None]:
     engine = create_async_engine(sqla_test_database_uri)
 
@@ -233,6 +366,7 @@ async def sqla_main_engine(
             migration_callback=sqla_migration_callback,
             alembic_config_path=sqla_alembic_config_path,
             migration_target=sqla_migration_target,
+            create_all_checkfirst=sqla_create_all_checkfirst,
         )
 
     yield engine
@@ -241,41 +375,45 @@ async def sqla_main_engine(
 
 
 @pytest_asyncio.fixture
-async def sqla_main_session(
+async def sqla_main_connection(
     sqla_main_engine: AsyncEngine,
-) -> AsyncGenerator[AsyncSession, None]:
+) -> AsyncGenerator[AsyncConnection, None]:
     connection = await sqla_main_engine.connect()
     transaction = await connection.begin()
 
-    session = AsyncSession(
-        bind=connection,
+    try:
+        yield connection
+    finally:
+        if transaction.is_active:
+            await transaction.rollback()
+        if not connection.closed:
+            await connection.close()
+
+
+@pytest.fixture(scope="session")
+def sqla_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
         expire_on_commit=False,
-        autocommit=False,
         autoflush=False,
+        join_transaction_mode="create_savepoint",
     )
-    await connection.begin_nested()
 
-    @event.listens_for(session.sync_session, "after_transaction_end")
-    def _restart_savepoint(_sync_session: Any, _transaction: Any) -> None:
-        sync_connection = connection.sync_connection
-        if connection.closed or sync_connection is None:
-            return
-        if (
-            sync_connection.in_transaction()
-            and not sync_connection.in_nested_transaction()
-        ):
-            sync_connection.begin_nested()
+
+@pytest_asyncio.fixture
+async def sqla_main_session(
+    sqla_main_connection: AsyncConnection,
+    sqla_session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncSession, None]:
+    test_savepoint = await sqla_main_connection.begin_nested()
+    session = sqla_session_factory(bind=sqla_main_connection)
 
     try:
         yield session
     finally:
-        event.remove(session.sync_session, "after_transaction_end", _restart_savepoint)
         session.expunge_all()
         await session.close()
-        if transaction.is_active:
-            await transaction.rollback()
-        if not connection.closed:
-            await connection.close()
+        if test_savepoint.is_active:
+            await test_savepoint.rollback()
 
 
 @pytest.fixture
@@ -288,13 +426,26 @@ async def sqla_test_data(
     sqla_main_session: AsyncSession,
     sqla_data_mapping: dict[str, ModelMapping],
 ) -> AsyncGenerator[dict[str, ModelMapping], None]:
-    for model in sqla_data_mapping.values():
-        for obj in model.values():
-            sqla_main_session.add(obj)
+    objects = [obj for model in sqla_data_mapping.values() for obj in model.values()]
+    sqla_main_session.add_all(objects)
     await sqla_main_session.commit()
 
-    for model in sqla_data_mapping.values():
-        for obj in model.values():
-            await sqla_main_session.refresh(obj)
+    identities: dict[type[Any], list[tuple[Any, ...]]] = {}
+    for obj in objects:
+        identity = inspect(obj).identity
+        if identity is not None:
+            identities.setdefault(type(obj), []).append(identity)
+
+    for entity_type, keys in identities.items():
+        primary_key = inspect(entity_type).primary_key
+        if len(primary_key) == 1:
+            criteria = primary_key[0].in_([key[0] for key in keys])
+        else:
+            criteria = tuple_(*primary_key).in_(keys)
+        await sqla_main_session.execute(
+            select(entity_type)
+            .where(criteria)
+            .execution_options(populate_existing=True)
+        )
 
     yield sqla_data_mapping
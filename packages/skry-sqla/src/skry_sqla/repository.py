@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from typing import Any, ClassVar, Generic, List, TypeVar, cast
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from functools import lru_cache
+from typing import Any, ClassVar, Generic, List, TypeVar
 
-from sqlalchemy import Select, asc, desc, func, select
+from sqlalchemy import Select, asc, desc, func, inspect, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, joinedload
 from sqlalchemy.sql import Executable
 
 from .entity_manager import AsyncEntityManager
-from .filters import Filter
+from .filters import Filter, apply_all
 
 DB = TypeVar("DB", bound=DeclarativeBase)
 SelectOptions = Sequence[Any] | None
+_EMPTY: tuple[Any, ...] = ()
 
 
 def apply_options(
@@ -23,41 +25,101 @@ def apply_options(
     return statement
 
 
+@lru_cache(maxsize=512)
+def _descriptor_names(entity_type: type[DeclarativeBase]) -> frozenset[str]:
+    return frozenset(inspect(entity_type).all_orm_descriptors.keys())
+
+
+@lru_cache(maxsize=4096)
+def _attr(entity_type: type[DeclarativeBase], name: str) -> Any:
+    if name not in _descriptor_names(entity_type):
+        return None
+    return getattr(entity_type, name)
+
+
+@lru_cache(maxsize=512)
+def _relation_map(entity_type: type[DeclarativeBase]) -> dict[str, Any]:
+    return {
+        name: getattr(entity_type, name)
+        for name in inspect(entity_type).relationships.keys()
+    }
+
+
+@lru_cache(maxsize=512)
+def _setters(entity_type: type[Any]) -> dict[str, Callable[[Any, Any], None]]:
+    return {
+        name: getattr(entity_type, name).__set__
+        for name in inspect(entity_type).column_attrs.keys()
+    }
+
+
+@lru_cache(maxsize=512)
+def _id_is_primary_key(entity_type: type[DeclarativeBase]) -> bool:
+    mapper = inspect(entity_type)
+    id_column = mapper.columns.get("id")
+    return id_column is not None and tuple(mapper.primary_key) == (id_column,)
+
+
+def _get_field(entity_type: type[DeclarativeBase], name: str) -> Any:
+    attr = _attr(entity_type, name)
+    if attr is None:
+        raise ValueError(f"Unknown field '{name}'")
+    return attr
+
+
+@lru_cache(maxsize=512)
+def _base_select(
+    entity_type: type[DeclarativeBase], fields: tuple[str, ...]
+) -> Select[Any]:
+    if not fields:
+        return select(entity_type)
+    return select(*[_get_field(entity_type, name) for name in fields])
+
+
+@lru_cache(maxsize=512)
+def _order_clauses(
+    entity_type: type[DeclarativeBase], order: tuple[str, ...]
+) -> tuple[Any, ...]:
+    clauses: list[Any] = []
+    for field in order:
+        if field.startswith("-"):
+            clauses.append(desc(_get_field(entity_type, field[1:])))
+        else:
+            clauses.append(asc(_get_field(entity_type, field)))
+    return tuple(clauses)
+
+
+@lru_cache(maxsize=512)
+def _count_select(entity_type: type[DeclarativeBase]) -> Select[Any]:
+    return select(func.count()).select_from(entity_type)
+
+
 class QueryBuilder(Generic[DB]):
     def __init__(
         self, entity_type: type[DB], fields: Sequence[str] | None = None
     ) -> None:
         self.entity_type = entity_type
-        if fields:
-            self.statement = select(*[self._get_field(name) for name in fields])
-        else:
-            self.statement = select(entity_type)
+        self.statement = _base_select(entity_type, tuple(fields) if fields else ())
 
-    def where(self, filters: Sequence[Filter] | None = None) -> QueryBuilder[DB]:
-        for item in filters or []:
-            self.statement = item.apply(self.statement, self.entity_type)
+    def where(self, filters: Sequence[Filter] | None = _EMPTY) -> QueryBuilder[DB]:
+        self.statement = apply_all(self.statement, self.entity_type, filters)
         return self
 
-    def order_by(self, order: Sequence[str] | None = None) -> QueryBuilder[DB]:
+    def order_by(self, order: Sequence[str] | None = _EMPTY) -> QueryBuilder[DB]:
         if not order:
             return self
 
-        clauses: list[Any] = []
-        for field in order:
-            direction = asc
-            field_name = field
-            if field.startswith("-"):
-                field_name = field[1:]
-                direction = desc
-            clauses.append(direction(self._get_field(field_name)))
-        self.statement = self.statement.order_by(*clauses)
+        self.statement = self.statement.order_by(
+            *_order_clauses(self.entity_type, tuple(order))
+        )
         return self
 
-    def relations(self, relations: Sequence[str] | None = None) -> QueryBuilder[DB]:
-        for relation in relations or []:
-            if not hasattr(self.entity_type, relation):
+    def relations(self, relations: Sequence[str] | None = _EMPTY) -> QueryBuilder[DB]:
+        relation_map = _relation_map(self.entity_type)
+        for relation in relations or _EMPTY:
+            relation_attr = relation_map.get(relation)
+            if relation_attr is None:
                 raise ValueError(f"Unknown relation '{relation}'")
-            relation_attr = self._get_field(relation)
             self.statement = self.statement.options(joinedload(relation_attr))
         return self
 
@@ -65,46 +127,58 @@ class QueryBuilder(Generic[DB]):
         return self.statement
 
     def _get_field(self, name: str) -> Any:
-        if not hasattr(self.entity_type, name):
-            raise ValueError(f"Unknown field '{name}'")
-        return getattr(self.entity_type, name)
+        return _get_field(self.entity_type, name)
 
 
 class AsyncRepository(Generic[DB]):
     model: ClassVar[type[DB]]
 
-    def __init__(self, session: AsyncSession) -> None:
-        if getattr(self.__class__, "model", None) is None:
-            raise ValueError(
-                f"{self.__class__.__name__}.model is not set. "
-                "Define class attribute `model`."
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if getattr(cls, "__parameters__", ()):
+            return
+        if getattr(cls, "model", None) is None:
+            raise TypeError(
+                f"{cls.__name__}.model is not set. Define class attribute `model`."
             )
+
+    def __init__(self, session: AsyncSession) -> None:
         self.entity_manager = AsyncEntityManager(session)
 
     async def add(self, entity: DB) -> DB:
-        return cast(DB, await self.entity_manager.save(entity))
+        return await self.entity_manager.save(entity)
 
     async def save(self, entity: DB) -> DB:
-        return cast(DB, await self.entity_manager.save(entity))
+        return await self.entity_manager.save(entity)
 
     def create(self, **kwargs: Any) -> DB:
         return self.model(**kwargs)
 
     def patch(self, entity: DB, data: Mapping[str, Any]) -> DB:
+        setters = _setters(type(entity))
         for field, value in data.items():
-            setattr(entity, field, value)
+            setter = setters.get(field)
+            if setter is None:
+                setattr(entity, field, value)
+            else:
+                setter(entity, value)
         return entity
 
     async def all(self, options: SelectOptions = None) -> list[DB]:
-        statement = apply_options(select(self.model), options)
+        statement = _base_select(self.model, ())
+        if options:
+            statement = statement.options(*options)
         return await self.list(statement)
 
     async def find(
         self,
-        filters: Sequence[Filter] | None = None,
-        order_by: Sequence[str] | None = None,
-        relations: Sequence[str] | None = None,
+        filters: Sequence[Filter] | None = _EMPTY,
+        order_by: Sequence[str] | None = _EMPTY,
+        relations: Sequence[str] | None = _EMPTY,
     ) -> list[DB]:
+        if not filters and not order_by and not relations:
+            return await self.list(_base_select(self.model, ()))
+
         statement = (
             QueryBuilder(self.model)
             .where(filters)
@@ -116,54 +190,69 @@ class AsyncRepository(Generic[DB]):
 
     async def find_and_count(
         self,
-        filters: Sequence[Filter] | None = None,
-        order_by: Sequence[str] | None = None,
-        relations: Sequence[str] | None = None,
+        filters: Sequence[Filter] | None = _EMPTY,
+        order_by: Sequence[str] | None = _EMPTY,
+        relations: Sequence[str] | None = _EMPTY,
     ) -> tuple[list[DB], int]:
         items = await self.find(
             filters=filters,
             order_by=order_by,
             relations=relations,
         )
-        total = await self.count(filters=filters)
-        return items, total
+        return items, len(items)
 
     async def find_one(
         self,
-        filters: Sequence[Filter] | None = None,
-        relations: Sequence[str] | None = None,
+        filters: Sequence[Filter] | None = _EMPTY,
+        relations: Sequence[str] | None = _EMPTY,
     ) -> DB | None:
+        if not filters and not relations:
+            return await self.get_one_or_none(_base_select(self.model, ()).limit(1))
+
         statement = QueryBuilder(self.model).where(filters).relations(relations).build()
-        return await self.get_one_or_none(statement)
+        return await self.get_one_or_none(statement.limit(1))
 
     async def get_one_or_none(self, statement: Executable) -> DB | None:
-        return cast(DB | None, await self.entity_manager.get_one_or_none(statement))
+        entity: DB | None = await self.entity_manager.get_one_or_none(statement)
+        return entity
 
     async def get_by_id(
         self, id_value: Any, options: SelectOptions = None
     ) -> DB | None:
-        if not hasattr(self.model, "id"):
+        id_column = _attr(self.model, "id")
+        if id_column is None:
             raise ValueError(f"{self.model.__name__} does not define id attribute")
 
-        model_with_id = cast(Any, self.model)
-        statement = select(self.model).where(model_with_id.id == id_value)
-        statement = apply_options(statement, options)
+        if _id_is_primary_key(self.model):
+            return await self.entity_manager.get(self.model, id_value, options=options)
+
+        statement = select(self.model).where(id_column == id_value)
+        if options:
+            statement = statement.options(*options)
         return await self.get_one_or_none(statement)
 
     async def list(self, statement: Executable) -> list[DB]:
-        return cast(list[DB], await self.entity_manager.list(statement))
+        return await self.entity_manager.list(statement)
+
+    async def stream(
+        self, statement: Executable, batch_size: int = 1000
+    ) -> AsyncIterator[List[DB]]:
+        async for batch in self.entity_manager.stream(statement, batch_size):
+            yield batch
 
-    async def count(self, filters: Sequence[Filter] | None = None) -> int:
-        statement = select(func.count()).select_from(self.model)
-        for item in filters or []:
-            statement = item.apply(statement, self.model)
+    async def count(self, filters: Sequence[Filter] | None = _EMPTY) -> int:
+        statement = apply_all(_count_select(self.model), self.model, filters)
 
         result = await self.entity_manager.execute_query(statement)
         value = result.scalar_one()
         return int(value)
 
-    async def exists(self, filters: Sequence[Filter] | None = None) -> bool:
-        return (await self.count(filters=filters)) > 0
+    async def exists(self, filters: Sequence[Filter] | None = _EMPTY) -> bool:
+        statement = apply_all(
+            select(literal(1)).select_from(self.model), self.model, filters
+        )
+        result = await self.entity_manager.execute_query(select(statement.exists()))
+        return bool(result.scalar_one())
 
     async def delete(self, entity: DB) -> None:
         await self.entity_manager.delete(entity)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
+import pytest
 import pytest_asyncio
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 pytest_plugins = ("skry_sqla.pytest_plugin",)
@@ -9,3 +13,18 @@ pytest_plugins = ("skry_sqla.pytest_plugin",)
 @pytest_asyncio.fixture
 async def session(sqla_main_session: AsyncSession) -> AsyncSession:
     return sqla_main_session
+
+
+@pytest.fixture
+def executed_statements(session: AsyncSession) -> Iterator[list[str]]:
+    statements: list[str] = []
+    engine = session.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
@@ -1,5 +1,6 @@
 from skry_sqla.model import Base
 from sqlalchemy import Integer, String
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -9,3 +10,15 @@ class User(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     name: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class Article(Base):
+    __tablename__ = "articles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    tags: Mapped[str] = mapped_column(String, nullable=False, default="")
+
+    @hybrid_property
+    def first_tag(self) -> str:
+        return self.tags.split(",")[0]
@@ -1,7 +1,12 @@
+import asyncio
+
 import pytest
 from model import User
+from skry_sqla import entity_manager
 from skry_sqla.entity_manager import AsyncEntityManager
+from skry_sqla.model import Base
 from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 pytestmark = pytest.mark.asyncio
 
@@ -33,3 +38,49 @@ async def test_get_nonexistent(session):
     )
 
     assert nonexisted is None
+
+
+async def test_get_accepts_dict_identity(session):
+    em = AsyncEntityManager(session)
+    user = await em.save(User(email="dict-ident@test.com", name="dict"))
+
+    assert await em.get(User, {"id": user.id}) is user
+
+
+async def test_cancelled_get_leaves_no_task_behind():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        async with AsyncSession(engine) as session:
+            em = AsyncEntityManager(session)
+            user = await em.save(User(email="cancel-get@test.com", name="cancel"))
+            user_id = user.id
+            session.expunge_all()
+
+            pending = asyncio.create_task(em.get(User, user_id))
+            await asyncio.sleep(0)
+            pending.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+    finally:
+        await engine.dispose()
+
+
+async def test_insert_many_splits_values_into_chunks(session, monkeypatch):
+    monkeypatch.setattr(entity_manager, "_MAX_BIND_PARAMS", 4)
+    em = AsyncEntityManager(session)
+
+    inserted = await em.insert_many(
+        User,
+        [{"email": f"chunk-{index}@test.com", "name": "chunk"} for index in range(5)],
+        returning=["email"],
+    )
+
+    assert [row["email"] for row in inserted] == [
+        f"chunk-{index}@test.com" for index in range(5)
+    ]
+    assert await em.insert_many(User, []) == []
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 import pytest
 from skry_sqla.filters import (
     And,
@@ -13,6 +15,7 @@ from skry_sqla.filters import (
     GreaterOrEqual,
     GreaterThan,
     ILike,
+    In,
     IsNotNull,
     IsNull,
     JsonContains,
@@ -25,6 +28,7 @@ from skry_sqla.filters import (
     NotIn,
     Or,
     StartsWith,
+    apply_all,
 )
 from sqlalchemy import String, select
 from sqlalchemy.dialects import postgresql
@@ -141,3 +145,144 @@ def test_additional_filters_compile(filter_item: ClauseFilter, token: str) -> No
 def test_base_clause_filter_raises_not_implemented() -> None:
     with pytest.raises(NotImplementedError):
         ClauseFilter().to_clause(PgEntity)
+
+
+def test_bound_filter_reuses_precomputed_clause() -> None:
+    filter_item = And([Equal("name", "alpha"), Not(IsNull("nickname"))]).bind(PgEntity)
+
+    child = filter_item.filters[0]
+    assert child.to_clause(PgEntity) is child.to_clause(PgEntity)
+    assert " AND " in _compile_postgres(filter_item.apply(select(PgEntity), PgEntity))
+
+
+def test_bound_filter_rebuilds_for_other_model() -> None:
+    class OtherEntity(PgBase):
+        __tablename__ = "other_entity"
+
+        id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+        name: Mapped[str] = mapped_column(String)
+
+    filter_item = Equal("name", "alpha").bind(PgEntity)
+
+    sql = _compile_postgres(filter_item.apply(select(OtherEntity), OtherEntity))
+    assert "other_entity.name" in sql
+
+
+def test_bound_filter_rebuilds_after_mutation() -> None:
+    child = Equal("name", "alpha")
+    filter_item = Not(child).bind(PgEntity)
+    stale = child.to_clause(PgEntity)
+
+    child.value = "beta"
+
+    assert child.to_clause(PgEntity) is not stale
+    assert child.to_clause(PgEntity).compile().params == {"name_1": "beta"}
+    assert filter_item.to_clause(PgEntity).compile().params == {"name_1": "beta"}
+
+
+def test_bind_supports_subclasses_overriding_to_clause() -> None:
+    class NameIsAlpha(ClauseFilter):
+        def to_clause(self, model: type[PgBase]) -> Any:
+            return model.name == "alpha"
+
+    filter_item = NameIsAlpha().bind(PgEntity)
+
+    sql = _compile_postgres(filter_item.apply(select(PgEntity), PgEntity))
+    assert "pg_entity.name = %(name_1)s" in sql
+
+
+def test_filters_keep_keyword_arguments() -> None:
+    statement = And(
+        [
+            In("name", values=["a", "b"]),
+            ILike("name", pattern="a%"),
+            StartsWith(field="name", value="a"),
+        ]
+    ).apply(select(PgEntity), PgEntity)
+    sql = _compile_postgres(statement)
+    assert " IN " in sql
+    assert " ILIKE " in sql
+    assert " LIKE " in sql
+
+
+def test_logical_filters_flatten_nested_trees() -> None:
+    nested = And([And([Equal("name", "a"), Equal("nickname", "b")]), IsNull("tags")])
+    single = Or([Equal("name", "a")])
+    double_not = Not(Not(IsNull("nickname")))
+
+    assert len(nested.filters) == 3
+    assert _compile_postgres(single.to_clause(PgEntity)) == _compile_postgres(
+        Equal("name", "a").to_clause(PgEntity)
+    )
+    assert _compile_postgres(double_not.to_clause(PgEntity)) == (
+        "pg_entity.nickname IS NULL"
+    )
+
+
+@pytest.mark.parametrize(
+    "filter_item",
+    [
+        Equal("name", "a"),
+        In("name", ["a", "b"]),
+        Like("name", "a%"),
+        NotEqual("name", "a"),
+        GreaterThan("name", "a"),
+        LessThan("name", "a"),
+        GreaterOrEqual("name", "a"),
+        LessOrEqual("name", "a"),
+        Between("name", "a", "m"),
+        IsNull("nickname"),
+        IsNotNull("nickname"),
+        ILike("name", "a%"),
+        StartsWith("name", "a"),
+        EndsWith("name", "a"),
+        Contains("name", "a"),
+        NotIn("name", ["a", "b"]),
+        JsonContains("payload", {"a": 1}),
+        JsonHasKey("payload", "a"),
+        ArrayContains("tags", ["a"]),
+        ArrayOverlap("tags", ["a"]),
+        And([Equal("name", "a"), IsNull("nickname")]),
+        Or([Equal("name", "a"), IsNull("nickname")]),
+        Not(Equal("name", "a")),
+    ],
+)
+def test_filter_clauses_support_compiled_cache(filter_item: ClauseFilter) -> None:
+    statement = filter_item.apply(select(PgEntity), PgEntity)
+    assert statement._generate_cache_key() is not None
+
+
+@pytest.mark.parametrize("filter_type", [In, NotIn])
+def test_list_filters_share_cache_key_across_lengths(
+    filter_type: type[In] | type[NotIn],
+) -> None:
+    short = filter_type("name", ["a"]).apply(select(PgEntity), PgEntity)
+    long = filter_type("name", ["a", "b", "c"]).apply(select(PgEntity), PgEntity)
+
+    short_key = short._generate_cache_key()
+    long_key = long._generate_cache_key()
+    assert short_key is not None and long_key is not None
+    assert short_key.key == long_key.key
+    assert "POSTCOMPILE" in str(short.compile(dialect=postgresql.dialect()))
+
+
+def test_array_filters_bind_values_with_column_type() -> None:
+    clause = ArrayOverlap("tags", ["a"]).to_clause(PgEntity)
+    assert isinstance(clause.right.type, ARRAY)
+
+
+def test_apply_all_batches_clause_filters_and_keeps_custom_filters() -> None:
+    class LimitOne:
+        def apply(self, stmt, model):
+            return stmt.limit(1)
+
+    statement = apply_all(
+        select(PgEntity),
+        PgEntity,
+        [Equal("name", "a"), LimitOne(), IsNull("nickname"), Equal("id", 1)],
+    )
+    sql = _compile_postgres(statement)
+
+    assert sql.count(" AND ") == 2
+    assert "LIMIT" in sql
+    assert apply_all(select(PgEntity), PgEntity, None).whereclause is None
@@ -1,6 +1,13 @@
 import skry_sqla
 from skry_sqla.entity_manager import AsyncEntityManager
-from skry_sqla.model import Base, CreatedUpdatedAtMixin, IDMixin, UUIDIDMixin
+from skry_sqla.model import (
+    Base,
+    CreatedUpdatedAtMixin,
+    IDMixin,
+    TimestamableMixin,
+    TimestampableMixin,
+    UUIDIDMixin,
+)
 from skry_sqla.repository import AsyncRepository
 
 
@@ -11,6 +18,12 @@ def test_public_exports() -> None:
     assert skry_sqla.IDMixin is IDMixin
     assert skry_sqla.UUIDIDMixin is UUIDIDMixin
     assert skry_sqla.CreatedUpdatedAtMixin is CreatedUpdatedAtMixin
+    assert skry_sqla.TimestampableMixin is TimestampableMixin
+
+
+def test_timestamable_mixin_is_alias() -> None:
+    assert TimestamableMixin is TimestampableMixin
+    assert skry_sqla.TimestamableMixin is TimestampableMixin
 
 
 def test_version_is_present() -> None:
@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import pytest
 from model import User
+from skry_sqla import pytest_plugin
+from skry_sqla.model import Base
 from skry_sqla.pytest_plugin import (
+    _alembic_modules,
+    _compiled_ddl,
     _initialize_schema,
+    _is_memory_database,
+    _plugin_config,
     _resolve_bool_setting,
     _resolve_string_setting,
+    _schema_hash,
 )
-from sqlalchemy import select, text
+from sqlalchemy import event, make_url, select, text
 from sqlalchemy.ext.asyncio import create_async_engine
 
 
@@ -171,3 +178,176 @@ def test_resolve_bool_setting_falls_back_to_ini() -> None:
         default=False,
     )
     assert value is False
+
+
+@pytest.mark.parametrize(
+    ("uri", "expected"),
+    [
+        ("sqlite+aiosqlite:///:memory:", True),
+        ("sqlite+aiosqlite://", True),
+        ("sqlite+aiosqlite:///test.db", False),
+        ("sqlite+aiosqlite:///file::memory:?cache=shared&uri=true", True),
+        ("sqlite+aiosqlite:///file:shared?mode=memory&uri=true", True),
+        ("postgresql+asyncpg://user@localhost/test", False),
+        ("postgresql+asyncpg://user@localhost/", False),
+    ],
+)
+def test_is_memory_database(uri: str, expected: bool) -> None:
+    assert _is_memory_database(make_url(uri)) is expected
+
+
+def test_plugin_config_is_resolved_once_per_config() -> None:
+    config = _FakePytestConfig(
+        options={"sqla_use_migrations": None},
+        ini={"sqla_alembic_config_path": "alembic.ini"},
+    )
+
+    resolved = _plugin_config(config)
+
+    assert _plugin_config(config) is resolved
+    assert resolved.database_uri == "sqlite+aiosqlite:///:memory:"
+    assert resolved.use_migrations is False
+    assert resolved.alembic_config_path == "alembic.ini"
+    assert resolved.migration_target == "head"
+
+
+@pytest.mark.parametrize(("raw", "expected"), [(" Yes ", True), ("off", False)])
+def test_resolve_bool_setting_parses_ini_strings(raw: str, expected: bool) -> None:
+    config = _FakePytestConfig(
+        options={"sqla_use_migrations": None},
+        ini={"sqla_use_migrations": raw},
+    )
+    value = _resolve_bool_setting(
+        pytestconfig=config,
+        option_name="sqla_use_migrations",
+        ini_name="sqla_use_migrations",
+        default=False,
+    )
+    assert value is expected
+
+
+def test_alembic_modules_report_missing_alembic(monkeypatch) -> None:
+    def missing_module(name: str) -> object:
+        raise ModuleNotFoundError(name)
+
+    monkeypatch.setattr(pytest_plugin, "import_module", missing_module)
+    _alembic_modules.cache_clear()
+    try:
+        with pytest.raises(RuntimeError, match="Alembic is required"):
+            _alembic_modules()
+    finally:
+        _alembic_modules.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_initialize_schema_checkfirst_skips_existing_tables() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY)"))
+        await connection.execute(text("INSERT INTO users (id) VALUES (7)"))
+        await _initialize_schema(
+            connection=connection,
+            use_migrations=False,
+            migration_callback=None,
+            alembic_config_path=None,
+            migration_target="head",
+            create_all_checkfirst=True,
+        )
+        user_ids = (await connection.execute(text("SELECT * FROM users"))).all()
+        tables = set(
+            (
+                await connection.execute(
+                    text("SELECT name FROM sqlite_master WHERE type='table'")
+                )
+            ).scalars()
+        )
+
+    await engine.dispose()
+
+    assert user_ids == [(7,)]
+    assert set(Base.metadata.tables) <= tables
+
+
+@pytest.mark.asyncio
+async def test_initialize_schema_reuses_compiled_ddl_for_memory_sqlite() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    ddl = _compiled_ddl(Base.metadata, engine.dialect)
+
+    async with engine.begin() as connection:
+        await _initialize_schema(
+            connection=connection,
+            use_migrations=False,
+            migration_callback=None,
+            alembic_config_path=None,
+            migration_target="head",
+        )
+        result = await connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type='table'")
+        )
+        tables = set(result.scalars().all())
+
+    await engine.dispose()
+
+    assert _compiled_ddl(Base.metadata, engine.dialect) is ddl
+    assert set(Base.metadata.tables) <= tables
+
+
+@pytest.mark.asyncio
+async def test_initialize_schema_runs_create_listeners_for_memory_sqlite() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    created: list[str] = []
+
+    def record(table, connection, **kwargs) -> None:
+        created.append(table.name)
+
+    event.listen(User.__table__, "after_create", record)
+    try:
+        async with engine.begin() as connection:
+            await _initialize_schema(
+                connection=connection,
+                use_migrations=False,
+                migration_callback=None,
+                alembic_config_path=None,
+                migration_target="head",
+            )
+    finally:
+        event.remove(User.__table__, "after_create", record)
+        await engine.dispose()
+
+    assert created == [User.__table__.name]
+
+
+@pytest.mark.asyncio
+async def test_initialize_schema_recreates_dropped_tables_for_stamped_database(
+    tmp_path,
+) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stamped.db'}")
+    options = {
+        "use_migrations": False,
+        "migration_callback": None,
+        "alembic_config_path": None,
+        "migration_target": "head",
+    }
+
+    async with engine.begin() as connection:
+        await _initialize_schema(connection=connection, **options)
+        await connection.execute(text("DROP TABLE users"))
+
+    async with engine.begin() as connection:
+        await _initialize_schema(connection=connection, **options)
+        tables = set(
+            (
+                await connection.execute(
+                    text("SELECT name FROM sqlite_master WHERE type='table'")
+                )
+            ).scalars()
+        )
+        versions = (
+            await connection.execute(text("SELECT version FROM _skry_meta"))
+        ).scalars().all()
+
+    await engine.dispose()
+
+    assert set(Base.metadata.tables) <= tables
+    assert versions == [_schema_hash(Base.metadata, engine.dialect)]
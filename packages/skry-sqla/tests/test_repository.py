@@ -1,8 +1,10 @@
+from typing import Any
+
 import pytest
-from model import User
+from model import Article, User
 from skry_sqla.exceptions import PersistenceError
 from skry_sqla.filters import Equal, GreaterThan, In, LessThan, Like, NotEqual
-from skry_sqla.repository import AsyncRepository
+from skry_sqla.repository import DB, AsyncRepository, QueryBuilder
 from sqlalchemy import func, select
 
 pytestmark = pytest.mark.asyncio
@@ -12,13 +14,18 @@ class UserRepository(AsyncRepository[User]):
     model = User
 
 
-class MissingModelRepository(AsyncRepository[User]):
-    pass
+@pytest.fixture
+def repo(session) -> UserRepository:
+    return UserRepository(session)
+
 
+async def seed_users(
+    repo: UserRepository, users: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    return await repo.insert_many(users, returning=["id", "email", "name"])
 
-async def test_add_and_get(session) -> None:
-    repo = UserRepository(session)
 
+async def test_add_and_get(repo) -> None:
     saved = await repo.add(User(email="repo-save@test.com", name="repo"))
     loaded = await repo.get_one_or_none(
         select(User).where(User.email == "repo-save@test.com")
@@ -29,10 +36,14 @@ async def test_add_and_get(session) -> None:
     assert loaded.email == "repo-save@test.com"
 
 
-async def test_list_returns_entities(session) -> None:
-    repo = UserRepository(session)
-    await repo.add(User(email="repo-list-a@test.com", name="a"))
-    await repo.add(User(email="repo-list-b@test.com", name="b"))
+async def test_list_returns_entities(repo) -> None:
+    await seed_users(
+        repo,
+        [
+            {"email": "repo-list-a@test.com", "name": "a"},
+            {"email": "repo-list-b@test.com", "name": "b"},
+        ],
+    )
 
     rows = await repo.list(select(User).where(User.email.like("repo-list-%")))
 
@@ -41,8 +52,7 @@ async def test_list_returns_entities(session) -> None:
     assert "repo-list-b@test.com" in emails
 
 
-async def test_delete_removes_entity(session) -> None:
-    repo = UserRepository(session)
+async def test_delete_removes_entity(repo) -> None:
     saved = await repo.add(User(email="repo-delete@test.com", name="delete-me"))
 
     await repo.delete(saved)
@@ -53,9 +63,7 @@ async def test_delete_removes_entity(session) -> None:
     assert removed is None
 
 
-async def test_insert_many_returns_requested_fields(session) -> None:
-    repo = UserRepository(session)
-
+async def test_insert_many_returns_requested_fields(repo) -> None:
     inserted = await repo.insert_many(
         [
             {"email": "bulk-a@test.com", "name": "bulk-a"},
@@ -69,8 +77,7 @@ async def test_insert_many_returns_requested_fields(session) -> None:
     assert {row["email"] for row in inserted} == {"bulk-a@test.com", "bulk-b@test.com"}
 
 
-async def test_add_rolls_back_and_raises_persistence_error(session) -> None:
-    repo = UserRepository(session)
+async def test_add_rolls_back_and_raises_persistence_error(repo, session) -> None:
     await repo.add(User(email="duplicate@test.com", name="first"))
 
     with pytest.raises(PersistenceError):
@@ -82,14 +89,25 @@ async def test_add_rolls_back_and_raises_persistence_error(session) -> None:
     assert count == 1
 
 
-async def test_missing_model_definition_raises_error(session) -> None:
-    with pytest.raises(ValueError, match="model"):
-        MissingModelRepository(session)
+async def test_missing_model_definition_raises_error() -> None:
+    with pytest.raises(TypeError, match="model"):
+
+        class MissingModelRepository(AsyncRepository[User]):
+            pass
+
+
+async def test_generic_repository_base_may_omit_model(session) -> None:
+    class BaseRepository(AsyncRepository[DB]):
+        pass
 
+    class ConcreteRepository(BaseRepository[User]):
+        model = User
 
-async def test_create_and_all(session) -> None:
-    repo = UserRepository(session)
+    repo = ConcreteRepository(session)
+    assert await repo.find() == []
 
+
+async def test_create_and_all(repo) -> None:
     user = repo.create(email="all-created@test.com", name="created")
     await repo.add(user)
 
@@ -98,11 +116,15 @@ async def test_create_and_all(session) -> None:
     assert any(item.email == "all-created@test.com" for item in items)
 
 
-async def test_find_applies_filters_and_order(session) -> None:
-    repo = UserRepository(session)
-    await repo.add(User(email="find-a@test.com", name="alpha"))
-    await repo.add(User(email="find-b@test.com", name="beta"))
-    await repo.add(User(email="find-c@test.com", name="skip"))
+async def test_find_applies_filters_and_order(repo) -> None:
+    await seed_users(
+        repo,
+        [
+            {"email": "find-a@test.com", "name": "alpha"},
+            {"email": "find-b@test.com", "name": "beta"},
+            {"email": "find-c@test.com", "name": "skip"},
+        ],
+    )
 
     items = await repo.find(
         filters=[Like("email", "find-%"), NotEqual("name", "skip")],
@@ -112,8 +134,7 @@ async def test_find_applies_filters_and_order(session) -> None:
     assert [item.email for item in items] == ["find-b@test.com", "find-a@test.com"]
 
 
-async def test_find_one_returns_first_match(session) -> None:
-    repo = UserRepository(session)
+async def test_find_one_returns_first_match(repo) -> None:
     await repo.add(User(email="find-one@test.com", name="single"))
 
     item = await repo.find_one(filters=[Equal("email", "find-one@test.com")])
@@ -122,11 +143,14 @@ async def test_find_one_returns_first_match(session) -> None:
     assert item.name == "single"
 
 
-async def test_find_supports_in_and_range_filters(session) -> None:
-    repo = UserRepository(session)
-    await repo.add(User(email="range-a@test.com", name="range-a"))
-    await repo.add(User(email="range-b@test.com", name="range-b"))
-    await repo.add(User(email="range-c@test.com", name="range-c"))
+async def test_find_supports_in_and_range_filters(repo) -> None:
+    await seed_users(
+        repo,
+        [
+            {"email": f"range-{suffix}@test.com", "name": f"range-{suffix}"}
+            for suffix in "abc"
+        ],
+    )
 
     items = await repo.find(
         filters=[
@@ -139,23 +163,17 @@ async def test_find_supports_in_and_range_filters(session) -> None:
     assert {item.email for item in items} == {"range-b@test.com"}
 
 
-async def test_find_raises_for_unknown_field(session) -> None:
-    repo = UserRepository(session)
-
+async def test_find_raises_for_unknown_field(repo) -> None:
     with pytest.raises(ValueError, match="Unknown field"):
         await repo.find(filters=[Equal("missing_field", "x")])
 
 
-async def test_find_raises_for_unknown_relation(session) -> None:
-    repo = UserRepository(session)
-
+async def test_find_raises_for_unknown_relation(repo) -> None:
     with pytest.raises(ValueError, match="Unknown relation"):
         await repo.find(relations=["missing_relation"])
 
 
-async def test_save_alias_and_get_by_id(session) -> None:
-    repo = UserRepository(session)
-
+async def test_save_alias_and_get_by_id(repo) -> None:
     user = await repo.save(User(email="save-alias@test.com", name="save"))
     loaded = await repo.get_by_id(user.id)
 
@@ -163,8 +181,7 @@ async def test_save_alias_and_get_by_id(session) -> None:
     assert loaded.email == "save-alias@test.com"
 
 
-async def test_patch_and_save_updates_entity(session) -> None:
-    repo = UserRepository(session)
+async def test_patch_and_save_updates_entity(repo) -> None:
     user = await repo.add(User(email="patch@test.com", name="before"))
 
     updated = await repo.save(repo.patch(user, {"name": "after"}))
@@ -175,10 +192,14 @@ async def test_patch_and_save_updates_entity(session) -> None:
     assert loaded.name == "after"
 
 
-async def test_count_and_exists(session) -> None:
-    repo = UserRepository(session)
-    await repo.add(User(email="count-a@test.com", name="count"))
-    await repo.add(User(email="count-b@test.com", name="count"))
+async def test_count_and_exists(repo) -> None:
+    await seed_users(
+        repo,
+        [
+            {"email": "count-a@test.com", "name": "count"},
+            {"email": "count-b@test.com", "name": "count"},
+        ],
+    )
 
     count = await repo.count(filters=[Like("email", "count-%")])
     exists = await repo.exists(filters=[Equal("email", "count-a@test.com")])
@@ -189,11 +210,15 @@ async def test_count_and_exists(session) -> None:
     assert missing is False
 
 
-async def test_find_and_count_returns_items_and_total(session) -> None:
-    repo = UserRepository(session)
-    await repo.add(User(email="fac-a@test.com", name="a"))
-    await repo.add(User(email="fac-b@test.com", name="b"))
-    await repo.add(User(email="other@test.com", name="c"))
+async def test_find_and_count_returns_items_and_total(repo) -> None:
+    await seed_users(
+        repo,
+        [
+            {"email": "fac-a@test.com", "name": "a"},
+            {"email": "fac-b@test.com", "name": "b"},
+            {"email": "other@test.com", "name": "c"},
+        ],
+    )
 
     items, total = await repo.find_and_count(
         filters=[Like("email", "fac-%")],
@@ -204,11 +229,137 @@ async def test_find_and_count_returns_items_and_total(session) -> None:
     assert [item.email for item in items] == ["fac-a@test.com", "fac-b@test.com"]
 
 
-async def test_find_and_count_empty_result(session) -> None:
-    repo = UserRepository(session)
+async def test_find_and_count_empty_result(repo) -> None:
     items, total = await repo.find_and_count(
         filters=[Equal("email", "missing@test.com")]
     )
 
     assert items == []
     assert total == 0
+
+
+async def test_query_builder_reuses_base_select() -> None:
+    base = QueryBuilder(User).build()
+    fields = QueryBuilder(User, ["email", "name"]).build()
+
+    assert QueryBuilder(User).build() is base
+    assert QueryBuilder(User, ["email", "name"]).build() is fields
+    assert QueryBuilder(User).where([Equal("name", "x")]).build() is not base
+    assert base.whereclause is None
+
+
+async def test_relations_reject_column_attributes() -> None:
+    with pytest.raises(ValueError, match="Unknown relation 'email'"):
+        QueryBuilder(User).relations(["email"])
+
+
+async def test_find_and_count_uses_single_query(repo, executed_statements) -> None:
+    await repo.add(User(email="fac-single@test.com", name="single"))
+    executed_statements.clear()
+    items, total = await repo.find_and_count(filters=[Like("email", "fac-single%")])
+
+    assert total == len(items) == 1
+    assert len(executed_statements) == 1
+
+
+async def test_exists_emits_exists_subquery(repo, executed_statements) -> None:
+    await repo.add(User(email="exists-sql@test.com", name="exists"))
+    executed_statements.clear()
+    assert await repo.exists(filters=[Equal("email", "exists-sql@test.com")])
+    assert not await repo.exists(filters=[Equal("email", "exists-no@test.com")])
+
+    assert all("EXISTS" in statement for statement in executed_statements)
+    assert not any("count(" in statement for statement in executed_statements)
+
+
+async def test_query_builder_statements_share_cache_key_across_values() -> None:
+    def build(email: str, names: list[str]):
+        return (
+            QueryBuilder(User)
+            .where([Equal("email", email), In("name", names)])
+            .order_by(["-email"])
+            .build()
+        )
+
+    first = build("a@test.com", ["a"])._generate_cache_key()
+    second = build("b@test.com", ["b", "c"])._generate_cache_key()
+
+    assert first is not None and second is not None
+    assert first.key == second.key
+
+
+async def test_patch_sets_columns_and_plain_attributes(repo) -> None:
+    user = User(email="patch-plain@test.com", name="before")
+
+    repo.patch(user, {"name": "after", "note": "not mapped"})
+
+    assert user.name == "after"
+    assert user.note == "not mapped"
+
+
+async def test_find_without_arguments_returns_all(repo) -> None:
+    await repo.add(User(email="find-all@test.com", name="all"))
+
+    items = await repo.find()
+    single = await repo.find_one()
+
+    assert [item.email for item in items] == ["find-all@test.com"]
+    assert single is not None and single.email == "find-all@test.com"
+
+
+async def test_stream_yields_batches(repo) -> None:
+    await repo.insert_many(
+        [{"email": f"stream-{index}@test.com", "name": "stream"} for index in range(5)]
+    )
+
+    batches = [
+        batch
+        async for batch in repo.stream(
+            select(User).where(User.name == "stream").order_by(User.email),
+            batch_size=2,
+        )
+    ]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0].email == "stream-0@test.com"
+
+
+async def test_find_one_limits_to_first_row(repo) -> None:
+    await seed_users(
+        repo,
+        [
+            {"email": "first-a@test.com", "name": "first"},
+            {"email": "first-b@test.com", "name": "first"},
+        ],
+    )
+
+    item = await repo.find_one(filters=[Equal("name", "first")])
+    any_item = await repo.find_one()
+
+    assert item is not None and item.name == "first"
+    assert any_item is not None
+
+
+async def test_get_by_id_hits_identity_map(repo, executed_statements) -> None:
+    user = await repo.add(User(email="identity@test.com", name="identity"))
+    executed_statements.clear()
+    first = await repo.get_by_id(user.id)
+    second = await repo.get_by_id(user.id)
+    missing = await repo.get_by_id(-1)
+
+    assert first is user and second is user
+    assert missing is None
+    assert len(executed_statements) == 1
+
+
+async def test_python_only_hybrid_does_not_break_field_lookup(session) -> None:
+    class ArticleRepository(AsyncRepository[Article]):
+        model = Article
+
+    repo = ArticleRepository(session)
+    article = await repo.add(Article(name="hybrid", tags="a,b"))
+
+    statement = QueryBuilder(Article).order_by(["name"]).build()
+    assert await repo.list(statement) == [article]
+    assert await repo.get_by_id(article.id) is article
+    assert article.first_tag == "a"
@@ -1,15 +1,32 @@
 import asyncio
-import heapq
-import itertools
 from collections import deque
 from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
 from copy import copy
-from inspect import isawaitable
-from logging import getLogger
-from typing import Any, Generic, TypeVar, cast
+from heapq import heapify, heappop, heapreplace
+from inspect import isawaitable, iscoroutinefunction
+from itertools import chain, islice
+from operator import attrgetter, itemgetter, methodcaller
+from types import BuiltinFunctionType
+from typing import Any, Generic, Literal, TypeVar, cast
 
 T = TypeVar("T")
 R = TypeVar("R")
+_DONE = object()
+_MAP, _FILTER, _TAP = 0, 1, 2
+_Stage = tuple[int, Callable[[Any], Any], bool]
+
+
+_SYNC_CALLABLES = (BuiltinFunctionType, attrgetter, itemgetter, methodcaller)
+
+
+def _classify(fn: Callable[..., Any]) -> Literal["sync", "coro", "maybe"]:
+    if iscoroutinefunction(fn):
+        return "coro"
+    if isinstance(fn, _SYNC_CALLABLES) or (
+        isinstance(fn, type) and not issubclass(fn, Awaitable)
+    ):
+        return "sync"
+    return "maybe"
 
 
 async def _await(value: R | Awaitable[R]) -> R:
@@ -18,19 +35,67 @@ async def _await(value: R | Awaitable[R]) -> R:
     return value
 
 
-def _extract_timestamp(item: Any) -> int:
-    return int(cast(dict[str, Any], item)["timestamp"])
+_extract_timestamp: Callable[[Any], int] = itemgetter("timestamp")
+
+
+class _FastQueue(Generic[T]):
+    def __init__(self, maxsize: int) -> None:
+        self.items: deque[T] = deque()
+        self.maxsize = maxsize
+        self.readable = asyncio.Event()
+        self.writable = asyncio.Event()
+
+    async def put(self, item: T) -> None:
+        items = self.items
+        while len(items) >= self.maxsize:
+            self.writable.clear()
+            await self.writable.wait()
+        items.append(item)
+        self.readable.set()
+
+    def put_nowait(self, item: T) -> None:
+        self.items.append(item)
+        self.readable.set()
+
+    async def get(self) -> T:
+        items = self.items
+        while not items:
+            self.readable.clear()
+            await self.readable.wait()
+        self.writable.set()
+        return items.popleft()
+
+
+class _SyncSource(Generic[T]):
+    def __init__(self, iterable: Iterable[T]) -> None:
+        self.iterator = iter(iterable)
+
+    def __aiter__(self) -> "_SyncSource[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        try:
+            return next(self.iterator)
+        except StopIteration:
+            raise StopAsyncIteration from None
 
 
 class Stream(Generic[T]):
+    _fused: tuple[AsyncIterable[Any], tuple[_Stage, ...]] | None = None
+
     def __init__(self, source: AsyncIterable[T]) -> None:
         self._source = aiter(source)
+        self._next = self._source.__anext__
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T]) -> "Stream[T]":
+        return cls(_SyncSource(iterable))
 
     def __aiter__(self) -> AsyncIterator[T]:
         return self
 
-    async def __anext__(self) -> T:
-        return await self._source.__anext__()
+    def __anext__(self) -> Awaitable[T]:
+        return self._next()
 
     def split(self, branches: int | None = None) -> "Stream[T] | tuple[Stream[T], ...]":
         if branches is not None:
@@ -43,22 +108,158 @@ class Stream(Generic[T]):
         except TypeError:
             return Stream(self._source)
 
+    def _fuse(
+        self, stage: _Stage, single: Callable[[], AsyncIterator[Any]]
+    ) -> "Stream[Any]":
+        if self._fused is None:
+            upstream: AsyncIterable[Any] = self
+            stages: tuple[_Stage, ...] = (stage,)
+            stream: Stream[Any] = Stream(single())
+        else:
+            upstream, stages = self._fused
+            stages = (*stages, stage)
+            stream = Stream(_run_fused(upstream, stages))
+        stream._fused = (upstream, stages)
+        return stream
+
     def map(self, predicate: Callable[[T], R | Awaitable[R]]) -> "Stream[R]":
+        kind = _classify(predicate)
+        if kind == "coro":
+            async_predicate = cast(Callable[[T], Awaitable[R]], predicate)
+
+            async def _map_async() -> AsyncIterator[R]:
+                async for item in self:
+                    yield await async_predicate(item)
+
+            return Stream(_map_async())
+
+        if kind == "sync":
+            sync_predicate = cast(Callable[[T], R], predicate)
+            source = self._source
+            if isinstance(source, _SyncSource):
+                return Stream.from_iterable(map(sync_predicate, source.iterator))
+
+            async def _map_sync() -> AsyncIterator[R]:
+                async for item in self:
+                    yield sync_predicate(item)
+
+            return self._fuse((_MAP, predicate, False), _map_sync)
+
         async def _map() -> AsyncIterator[R]:
             async for item in self:
-                yield await _await(predicate(item))
+                result = predicate(item)
+                if isawaitable(result):
+                    result = await result
+                yield cast(R, result)
+
+        return self._fuse((_MAP, predicate, True), _map)
+
+    def batch_map(
+        self,
+        predicate: Callable[[list[T]], Iterable[R] | Awaitable[Iterable[R]]],
+        size: int = 1024,
+    ) -> "Stream[R]":
+        if size <= 0:
+            raise ValueError("size must be > 0")
+
+        async def _batch_map() -> AsyncIterator[R]:
+            async for batch in self.chunk(size):
+                for item in await _await(predicate(batch)):
+                    yield item
 
-        return Stream(_map())
+        return Stream(_batch_map())
+
+    def map_batched(
+        self,
+        fn: Callable[[list[T], int], Iterable[R] | Awaitable[Iterable[R]]],
+        size: int = 1024,
+    ) -> "Stream[R]":
+        if size <= 0:
+            raise ValueError("size must be > 0")
+
+        async def _map_batched() -> AsyncIterator[R]:
+            buffer = cast(list[T], [None] * size)
+            filled = 0
+            async for item in self:
+                buffer[filled] = item
+                filled += 1
+                if filled == size:
+                    for result in await _await(fn(buffer, filled)):
+                        yield result
+                    filled = 0
+            if filled:
+                for result in await _await(fn(buffer, filled)):
+                    yield result
+
+        return Stream(_map_batched())
 
     def tap(self, callback: Callable[[T], Any | Awaitable[Any]]) -> "Stream[T]":
+        kind = _classify(callback)
+        if kind == "coro":
+
+            async def _tap_async() -> AsyncIterator[T]:
+                async for item in self:
+                    await callback(item)
+                    yield item
+
+            return Stream(_tap_async())
+
+        if kind == "sync":
+
+            async def _tap_sync() -> AsyncIterator[T]:
+                async for item in self:
+                    callback(item)
+                    yield item
+
+            return self._fuse((_TAP, callback, False), _tap_sync)
+
         async def _tap() -> AsyncIterator[T]:
             async for item in self:
-                await _await(callback(item))
+                result = callback(item)
+                if isawaitable(result):
+                    await result
                 yield item
 
-        return Stream(_tap())
+        return self._fuse((_TAP, callback, True), _tap)
+
+    def prefetch(self, size: int) -> "Stream[T]":
+        if size <= 0:
+            raise ValueError("size must be > 0")
+
+        async def _prefetch() -> AsyncIterator[T]:
+            queue: _FastQueue[T | object] = _FastQueue(size)
+            error: BaseException | None = None
+
+            async def _produce() -> None:
+                nonlocal error
+                try:
+                    async for item in self:
+                        await queue.put(item)
+                except BaseException as exc:
+                    error = exc
+                finally:
+                    queue.put_nowait(_DONE)
+
+            producer = asyncio.create_task(_produce())
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is _DONE:
+                        break
+                    yield cast(T, item)
+                if error is not None:
+                    raise error
+            finally:
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+        return Stream(_prefetch())
 
     def flatten(self: "Stream[Iterable[R]]") -> "Stream[R]":
+        source = self._source
+        if isinstance(source, _SyncSource):
+            return Stream.from_iterable(chain.from_iterable(source.iterator))
+
         async def _flatten() -> AsyncIterator[R]:
             async for item in self:
                 for nested in item:
@@ -67,14 +268,44 @@ class Stream(Generic[T]):
         return Stream(_flatten())
 
     def filter(self, predicate: Callable[[T], bool | Awaitable[bool]]) -> "Stream[T]":
+        kind = _classify(predicate)
+        if kind == "coro":
+            async_predicate = cast(Callable[[T], Awaitable[bool]], predicate)
+
+            async def _filter_async() -> AsyncIterator[T]:
+                async for item in self:
+                    if await async_predicate(item):
+                        yield item
+
+            return Stream(_filter_async())
+
+        if kind == "sync":
+            source = self._source
+            if isinstance(source, _SyncSource):
+                return Stream.from_iterable(filter(predicate, source.iterator))
+
+            async def _filter_sync() -> AsyncIterator[T]:
+                async for item in self:
+                    if predicate(item):
+                        yield item
+
+            return self._fuse((_FILTER, predicate, False), _filter_sync)
+
         async def _filter() -> AsyncIterator[T]:
             async for item in self:
-                if await _await(predicate(item)):
+                result = predicate(item)
+                if isawaitable(result):
+                    result = await result
+                if result:
                     yield item
 
-        return Stream(_filter())
+        return self._fuse((_FILTER, predicate, True), _filter)
 
     def enumerate(self, start: int = 0) -> "Stream[tuple[int, T]]":
+        source = self._source
+        if isinstance(source, _SyncSource):
+            return Stream.from_iterable(enumerate(source.iterator, start))
+
         async def _enumerate() -> AsyncIterator[tuple[int, T]]:
             index = start
             async for item in self:
@@ -84,78 +315,92 @@ class Stream(Generic[T]):
         return Stream(_enumerate())
 
     def take(self, count: int) -> "Stream[T]":
+        source = self._source
+        if isinstance(source, _SyncSource):
+            return Stream.from_iterable(islice(source.iterator, max(count, 0)))
+
         async def _take() -> AsyncIterator[T]:
             if count <= 0:
                 return
             seen = 0
-            iterator = aiter(self)
-            while seen < count:
-                try:
-                    item = await anext(iterator)
-                except StopAsyncIteration:
-                    break
+            async for item in self:
                 yield item
                 seen += 1
+                if seen >= count:
+                    return
 
         return Stream(_take())
 
     def skip(self, count: int) -> "Stream[T]":
+        source = self._source
+        if isinstance(source, _SyncSource):
+            return Stream.from_iterable(islice(source.iterator, max(count, 0), None))
+
         async def _skip() -> AsyncIterator[T]:
-            skipped = 0
-            async for item in self:
-                if skipped < count:
+            if count > 0:
+                skipped = 0
+                async for _ in self:
                     skipped += 1
-                    continue
+                    if skipped >= count:
+                        break
+            async for item in self:
                 yield item
 
         return Stream(_skip())
 
     def merge(self, *others: AsyncIterable[T]) -> "Stream[T]":
+        if not others:
+            return self
+
         async def _merge() -> AsyncIterator[T]:
-            sources: tuple[AsyncIterable[T], ...] = (self, *others)
-            done_marker = object()
-            queue: asyncio.Queue[T | BaseException | object] = asyncio.Queue()
+            sources = (self, *others)
+            queue: _FastQueue[T | object] = _FastQueue(len(sources))
+            error: BaseException | None = None
 
             async def _pump(source: AsyncIterable[T]) -> None:
+                nonlocal error
                 try:
                     async for item in source:
                         await queue.put(item)
                 except BaseException as exc:
-                    await queue.put(exc)
+                    if error is None:
+                        error = exc
                 finally:
-                    await queue.put(done_marker)
-
-            tasks = [asyncio.create_task(_pump(source)) for source in sources]
-            active_sources = len(tasks)
-
-            while active_sources > 0:
-                item = await queue.get()
-                if item is done_marker:
-                    active_sources -= 1
-                    continue
-                if isinstance(item, BaseException):
-                    for task in tasks:
-                        task.cancel()
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                    raise item
-                yield cast(T, item)
-
-            await asyncio.gather(*tasks, return_exceptions=True)
+                    queue.put_nowait(_DONE)
+
+            producers = [asyncio.create_task(_pump(source)) for source in sources]
+            remaining = len(producers)
+            try:
+                while remaining:
+                    item = await queue.get()
+                    if item is _DONE:
+                        if error is not None:
+                            raise error
+                        remaining -= 1
+                        continue
+                    yield cast(T, item)
+            finally:
+                for producer in producers:
+                    producer.cancel()
+                await asyncio.gather(*producers, return_exceptions=True)
 
         return Stream(_merge())
 
     def zip(self, *others: AsyncIterable[Any]) -> "Stream[tuple[Any, ...]]":
+        if len(others) == 1:
+            return Stream(_zip2(self, others[0]))
+
         async def _zip() -> AsyncIterator[tuple[Any, ...]]:
-            iterators = [aiter(self), *(aiter(other) for other in others)]
+            nexts = [self.__anext__, *(aiter(other).__anext__ for other in others)]
 
             while True:
                 items: list[Any] = []
-                for iterator in iterators:
+                append = items.append
+                for next_item in nexts:
                     try:
-                        item = await anext(iterator)
+                        append(await next_item())
                     except StopAsyncIteration:
                         return
-                    items.append(item)
                 yield tuple(items)
 
         return Stream(_zip())
@@ -165,21 +410,24 @@ class Stream(Generic[T]):
         *others: AsyncIterable[Any],
         fillvalue: Any = None,
     ) -> "Stream[tuple[Any, ...]]":
+        if len(others) == 1:
+            return Stream(_zip_longest2(self, others[0], fillvalue))
+
         async def _zip_longest() -> AsyncIterator[tuple[Any, ...]]:
-            iterators = [aiter(self), *(aiter(other) for other in others)]
-            finished = [False] * len(iterators)
+            nexts = [self.__anext__, *(aiter(other).__anext__ for other in others)]
+            finished = [False] * len(nexts)
 
             while True:
                 items: list[Any] = []
                 all_finished = True
 
-                for index, iterator in enumerate(iterators):
+                for index, next_item in enumerate(nexts):
                     if finished[index]:
                         items.append(fillvalue)
                         continue
 
                     try:
-                        item = await anext(iterator)
+                        item = await next_item()
                     except StopAsyncIteration:
                         finished[index] = True
                         items.append(fillvalue)
@@ -200,74 +448,74 @@ class Stream(Generic[T]):
         *others: AsyncIterable[T],
         key: Callable[[T], Any] | None = None,
     ) -> "Stream[T]":
+        if len(others) == 1:
+            return Stream(_merge_ordered2(self, others[0], key))
+
         async def _merge_ordered() -> AsyncIterator[T]:
             sources: tuple[AsyncIterable[T], ...] = (self, *others)
-            if not sources:
-                return
-
-            key_fn: Callable[[T], Any]
-            if key is None:
-
-                def _identity(value: T) -> T:
-                    return value
-
-                key_fn = _identity
-            else:
-                key_fn = key
-
-            order_counter = itertools.count()
-            heap: list[tuple[Any, int, int, T]] = []
+            get_key = key
+            heap: list[tuple[Any, int, T]] = []
             iterators = [aiter(source) for source in sources]
+            nexts = [iterator.__anext__ for iterator in iterators]
 
-            for source_index, iterator in enumerate(iterators):
+            for source_index, next_item in enumerate(nexts):
                 try:
-                    item = await anext(iterator)
+                    item = await next_item()
                 except StopAsyncIteration:
                     continue
-                heapq.heappush(
-                    heap,
-                    (key_fn(item), source_index, next(order_counter), item),
+                heap.append(
+                    (item if get_key is None else get_key(item), source_index, item)
                 )
+            heapify(heap)
 
-            while heap:
-                _, source_index, _, item = heapq.heappop(heap)
+            while len(heap) > 1:
+                _, source_index, item = heap[0]
                 yield item
-                iterator = iterators[source_index]
                 try:
-                    next_item = await anext(iterator)
+                    item = await nexts[source_index]()
                 except StopAsyncIteration:
+                    heappop(heap)
                     continue
-                heapq.heappush(
+                heapreplace(
                     heap,
-                    (
-                        key_fn(next_item),
-                        source_index,
-                        next(order_counter),
-                        next_item,
-                    ),
+                    (item if get_key is None else get_key(item), source_index, item),
                 )
 
+            if heap:
+                _, source_index, item = heap[0]
+                yield item
+                async for item in iterators[source_index]:
+                    yield item
+
         return Stream(_merge_ordered())
 
     def keyed(self, key_name: str) -> "Stream[tuple[Any, T]]":
+        get_key: Callable[[Any], Any] = itemgetter(key_name)
+
         async def _keyed() -> AsyncIterator[tuple[Any, T]]:
             async for item in self:
-                key = cast(dict[str, Any], item)[key_name]
-                yield key, item
+                yield get_key(item), item
 
         return Stream(_keyed())
 
     def chunk(self, size: int = 10) -> "AggregatedStream":
+        source = self._source
+        if size > 0 and isinstance(source, _SyncSource):
+            iterator = source.iterator
+            return AggregatedStream(
+                _SyncSource(iter(lambda: list(islice(iterator, size)), []))
+            )
+
         async def _chunk() -> AsyncIterator[list[T]]:
             chunk: list[T] = []
             async for item in self:
                 if len(chunk) < size:
                     chunk.append(item)
                 else:
-                    yield chunk.copy()
+                    yield chunk
                     chunk = [item]
             if chunk:
-                yield chunk.copy()
+                yield chunk
 
         return AggregatedStream(_chunk())
 
@@ -281,21 +529,22 @@ class Stream(Generic[T]):
         get_timestamp = timestamp_getter or _extract_timestamp
 
         async def _window() -> AsyncIterator[list[T]]:
-            chunk: list[T] = []
-            ts: int | None = None
+            try:
+                first = await self.__anext__()
+            except StopAsyncIteration:
+                return
+            chunk = [first]
+            end = get_timestamp(first) + interval
             async for item in self:
                 timestamp = get_timestamp(item)
-                if ts is None:
-                    ts = timestamp
-                if ts + interval >= timestamp:
+                if timestamp <= end:
                     chunk.append(item)
                 else:
-                    if chunk:
-                        yield chunk.copy()
+                    yield chunk
                     chunk = [item]
-                    ts = timestamp
-            if include_partial and chunk:
-                yield chunk.copy()
+                    end = timestamp + interval
+            if include_partial:
+                yield chunk
 
         return AggregatedStream(_window())
 
@@ -315,7 +564,11 @@ class Stream(Generic[T]):
         get_timestamp = timestamp_getter or _extract_timestamp
 
         async def _window() -> AsyncIterator[list[T]]:
-            windows: list[dict[str, Any]] = []
+            items: deque[T] = deque()
+            offset = 0
+            index = 0
+            window_starts: deque[int] = deque()
+            window_heads: deque[int] = deque()
             last_start: int | None = None
 
             async for item in self:
@@ -325,34 +578,42 @@ class Stream(Generic[T]):
                 timestamp = get_timestamp(item)
                 if last_start is None:
                     last_start = timestamp
-                    windows.append({"ts": last_start, "items": []})
+                    window_starts.append(last_start)
+                    window_heads.append(index)
                 else:
                     while timestamp - last_start >= advance:
                         last_start += advance
-                        windows.append({"ts": last_start, "items": []})
-
-                next_windows: list[dict[str, Any]] = []
-                for window in windows:
-                    window_items = cast(list[T], window["items"])
-                    window_start = cast(int, window["ts"])
-                    if timestamp - window_start >= size:
-                        if window_items:
-                            yield window_items
-                        continue
-                    window_items.append(item)
-                    next_windows.append(window)
-
-                windows = next_windows
+                        window_starts.append(last_start)
+                        window_heads.append(index)
+
+                while window_starts and timestamp - window_starts[0] >= size:
+                    window_starts.popleft()
+                    head = window_heads.popleft()
+                    if head < index:
+                        yield list(islice(items, head - offset, index - offset))
+
+                oldest = window_heads[0] if window_heads else index + 1
+                while offset < oldest and items:
+                    items.popleft()
+                    offset += 1
+                if window_heads:
+                    items.append(item)
+                else:
+                    offset += 1
+                index += 1
 
             if include_partial:
-                for window in windows:
-                    window_items = cast(list[T], window["items"])
-                    if window_items:
-                        yield window_items
+                for head in window_heads:
+                    if head < index:
+                        yield list(islice(items, head - offset, None))
 
         return AggregatedStream(_window())
 
     async def to_list(self) -> list[T]:
+        source = self._source
+        if isinstance(source, _SyncSource):
+            return list(source.iterator)
+
         result: list[T] = []
         async for item in self:
             result.append(item)
@@ -361,47 +622,78 @@ class Stream(Generic[T]):
     async def sink(
         self, sink: Callable[[T], Any | Awaitable[Any]], parallel: int = 1
     ) -> None:
-        chunk: list[Awaitable[Any]] = []
-        async for item in self:
-            chunk.append(_await(sink(item)))
-            if len(chunk) == parallel:
-                await asyncio.gather(*chunk)
-                getLogger("Stream").info("Gathering")
-                chunk = []
+        kind = _classify(sink)
+        if kind == "sync":
+            async for item in self:
+                sink(item)
+            return
 
-        if chunk:
-            await asyncio.gather(*chunk)
+        if parallel <= 1:
+            async for item in self:
+                result = sink(item)
+                if kind == "coro" or isawaitable(result):
+                    await result
+            return
+
+        in_flight: set[asyncio.Future[Any]] = set()
+        try:
+            async for item in self:
+                result = sink(item)
+                if kind == "maybe" and not isawaitable(result):
+                    continue
+                in_flight.add(asyncio.ensure_future(result))
+                if len(in_flight) >= parallel:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        future.result()
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+                in_flight = set()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
 
 class AggregatedStream(Stream[Any]):
     def group_by(self, key_name: str) -> "Stream[dict[Any, list[Any]]]":
+        get_key = itemgetter(key_name)
+
         async def _group_by() -> AsyncIterator[dict[Any, list[Any]]]:
             async for chunk in self:
                 group: dict[Any, list[Any]] = {}
                 for item in chunk:
-                    key = cast(dict[str, Any], item)[key_name]
-                    if key not in group:
-                        group[key] = []
-                    group[key].append(item)
+                    key = get_key(item)
+                    bucket = group.get(key)
+                    if bucket is None:
+                        group[key] = [item]
+                    else:
+                        bucket.append(item)
                 yield group
 
         return Stream(_group_by())
 
-    def groupBy(self, key_name: str) -> "Stream[dict[Any, list[Any]]]":
-        return self.group_by(key_name)
+    groupBy = group_by
 
 
 class _SplitState(Generic[T]):
     def __init__(self, source: AsyncIterable[T], branches: int) -> None:
         self.iterator = aiter(source)
         self.buffers: list[deque[T]] = [deque() for _ in range(branches)]
+        self.ready = [asyncio.Event() for _ in range(branches)]
+        self.waiting: set[int] = set()
         self.done = False
         self.error: BaseException | None = None
-        self.lock = asyncio.Lock()
+        self.producing = False
 
     async def next_for(self, index: int) -> T:
+        buffer = self.buffers[index]
+        ready = self.ready[index]
         while True:
-            buffer = self.buffers[index]
             if buffer:
                 return buffer.popleft()
 
@@ -410,25 +702,28 @@ class _SplitState(Generic[T]):
                     raise self.error
                 raise StopAsyncIteration
 
-            async with self.lock:
-                buffer = self.buffers[index]
-                if buffer:
-                    continue
-                if self.done:
-                    continue
-
-                try:
-                    item = await anext(self.iterator)
-                except StopAsyncIteration:
-                    self.done = True
-                    continue
-                except BaseException as exc:
-                    self.error = exc
-                    self.done = True
-                    continue
-
+            if self.producing:
+                ready.clear()
+                self.waiting.add(index)
+                await ready.wait()
+                continue
+
+            self.producing = True
+            try:
+                item = await anext(self.iterator)
+            except StopAsyncIteration:
+                self.done = True
+            except Exception as exc:
+                self.error = exc
+                self.done = True
+            else:
                 for branch_buffer in self.buffers:
                     branch_buffer.append(item)
+            finally:
+                self.producing = False
+                waiting = self.waiting
+                while waiting:
+                    self.ready[waiting.pop()].set()
 
 
 def _split_stream(source: AsyncIterable[T], branches: int) -> tuple[Stream[T], ...]:
@@ -445,3 +740,94 @@ def _split_stream(source: AsyncIterable[T], branches: int) -> tuple[Stream[T], .
         return Stream(_iterator())
 
     return tuple(_branch(index) for index in range(branches))
+
+
+async def _run_fused(
+    upstream: AsyncIterable[Any], stages: tuple[_Stage, ...]
+) -> AsyncIterator[Any]:
+    async for item in upstream:
+        for op, fn, maybe_awaitable in stages:
+            result = fn(item)
+            if maybe_awaitable and isawaitable(result):
+                result = await result
+            if op == _MAP:
+                item = result
+            elif op == _FILTER and not result:
+                break
+        else:
+            yield item
+
+
+async def _zip2(
+    left: AsyncIterable[Any], right: AsyncIterable[Any]
+) -> AsyncIterator[tuple[Any, Any]]:
+    next_left = aiter(left).__anext__
+    next_right = aiter(right).__anext__
+    while True:
+        try:
+            item = await next_left()
+            yield item, await next_right()
+        except StopAsyncIteration:
+            return
+
+
+async def _zip_longest2(
+    left: AsyncIterable[Any], right: AsyncIterable[Any], fillvalue: Any
+) -> AsyncIterator[tuple[Any, Any]]:
+    left_iterator = aiter(left)
+    right_iterator = aiter(right)
+    async for item in left_iterator:
+        try:
+            other = await anext(right_iterator)
+        except StopAsyncIteration:
+            yield item, fillvalue
+            async for item in left_iterator:
+                yield item, fillvalue
+            return
+        yield item, other
+    async for other in right_iterator:
+        yield fillvalue, other
+
+
+async def _merge_ordered2(
+    left: AsyncIterable[T], right: AsyncIterable[T], key: Callable[[T], Any] | None
+) -> AsyncIterator[T]:
+    left_iterator = aiter(left)
+    right_iterator = aiter(right)
+    try:
+        left_item = await anext(left_iterator)
+    except StopAsyncIteration:
+        async for item in right_iterator:
+            yield item
+        return
+    try:
+        right_item = await anext(right_iterator)
+    except StopAsyncIteration:
+        yield left_item
+        async for item in left_iterator:
+            yield item
+        return
+
+    left_key: Any = left_item if key is None else key(left_item)
+    right_key: Any = right_item if key is None else key(right_item)
+    while True:
+        if right_key < left_key:
+            yield right_item
+            try:
+                right_item = await anext(right_iterator)
+            except StopAsyncIteration:
+                yield left_item
+                async for item in left_iterator:
+                    yield item
+                return
+            right_key = right_item if key is None else key(right_item)
+        else:
+            yield left_item
+            try:
+                left_item = await anext(left_iterator)
+            except StopAsyncIteration:
+                yield right_item
+                async for item in right_iterator:
+                    yield item
+                return
+            left_key = left_item if key is None else key(left_item)
@@ -1,9 +1,11 @@
 import asyncio
+import itertools
 from collections.abc import AsyncIterator
+from operator import itemgetter
 from typing import Any
 
 import pytest
-from skry_stream import Stream
+from skry_stream import AggregatedStream, Stream
 
 
 async def source(items: list[Any]) -> AsyncIterator[Any]:
@@ -28,6 +30,144 @@ async def test_map_filter_and_flatten() -> None:
     assert await collect(nested) == [1, 2, 3, 4, 5]
 
 
+@pytest.mark.asyncio
+async def test_filter_accepts_sync_and_async_predicates() -> None:
+    async def is_even(item: int) -> bool:
+        return item % 2 == 0
+
+    evens = await Stream(source([1, 2, 3, 4])).filter(is_even).to_list()
+    assert evens == [2, 4]
+
+    odds = await Stream(source([1, 2, 3, 4])).filter(lambda x: x % 2 == 1).to_list()
+    assert odds == [1, 3]
+
+    deferred = await Stream(source([1, 2, 3])).filter(lambda x: is_even(x)).to_list()
+    assert deferred == [2]
+
+
+@pytest.mark.asyncio
+async def test_operators_dispatch_on_callable_kind() -> None:
+    async def negate(item: int) -> int:
+        return -item
+
+    assert await Stream(source([1, 2])).map(negate).to_list() == [-1, -2]
+    assert await Stream(source([1, 2])).map(str).to_list() == ["1", "2"]
+    assert await Stream(source([1, 2])).map(lambda x: negate(x)).to_list() == [-1, -2]
+    assert await Stream(source([0, 1, 2])).filter(bool).to_list() == [1, 2]
+
+    seen: list[int] = []
+
+    async def record(item: int) -> None:
+        seen.append(item)
+
+    await (
+        Stream(source([1]))
+        .tap(record)
+        .tap(seen.append)
+        .tap(lambda x: record(x * 10))
+        .to_list()
+    )
+    assert seen == [1, 1, 10]
+
+    seen.clear()
+    await Stream(source([1, 2])).sink(seen.append)
+    await Stream(source([3])).sink(record)
+    await Stream(source([4])).sink(lambda x: record(x))
+    await Stream(source([5])).sink(lambda x: seen.append(x))
+    assert seen == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_from_iterable_wraps_sync_sources() -> None:
+    assert await Stream.from_iterable([1, 2, 3]).to_list() == [1, 2, 3]
+
+    stream = Stream.from_iterable(iter(range(4)))
+    assert await anext(stream) == 0
+    assert await stream.to_list() == [1, 2, 3]
+
+    doubled = await Stream.from_iterable([1, 2]).map(lambda x: x * 2).to_list()
+    assert doubled == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_fused_sync_stages_keep_order_and_awaitables() -> None:
+    async def halve(item: int) -> int:
+        return item // 2
+
+    seen: list[int] = []
+    result = await (
+        Stream(source([1, 2, 3, 4, 5, 6]))
+        .map(lambda x: x * 10)
+        .tap(seen.append)
+        .filter(lambda x: x != 30)
+        .map(lambda x: halve(x))
+        .map(halve)
+        .map(str)
+        .filter(lambda x: x != "7")
+        .to_list()
+    )
+
+    assert seen == [10, 20, 30, 40, 50, 60]
+    assert result == ["2", "5", "10", "12", "15"]
+
+
+@pytest.mark.asyncio
+async def test_sync_backed_take_skip_and_chunk() -> None:
+    numbers = list(range(7))
+    assert await Stream.from_iterable(numbers).skip(2).take(3).to_list() == [2, 3, 4]
+    assert await Stream.from_iterable(numbers).take(-1).to_list() == []
+    assert await Stream.from_iterable(numbers).skip(10).to_list() == []
+    chunks = await Stream.from_iterable(numbers).chunk(3).to_list()
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6]]
+    flat = await Stream.from_iterable(numbers).chunk(3).flatten().to_list()
+    assert flat == numbers
+
+    pipeline = Stream.from_iterable(["a", "", "bc"]).filter(bool).map(len).enumerate(1)
+    assert await pipeline.to_list() == [(1, 1), (2, 2)]
+    assert isinstance(pipeline._source, type(Stream.from_iterable([])._source))
+
+    assert await Stream(source([1, 2])).skip(5).to_list() == []
+    assert await Stream(source([1, 2])).skip(-1).to_list() == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_map_applies_function_per_batch() -> None:
+    batches: list[list[int]] = []
+
+    def double(items: list[int]) -> list[int]:
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    async def async_negate(items: list[int]) -> list[int]:
+        return [-item for item in items]
+
+    result = await Stream(source([1, 2, 3, 4, 5])).batch_map(double, size=2).to_list()
+    assert result == [2, 4, 6, 8, 10]
+    assert batches == [[1, 2], [3, 4], [5]]
+
+    negated = await Stream(source([1, 2])).batch_map(async_negate).to_list()
+    assert negated == [-1, -2]
+
+    with pytest.raises(ValueError):
+        Stream(source([1])).batch_map(double, 0)
+
+
+@pytest.mark.asyncio
+async def test_map_batched_reuses_one_buffer() -> None:
+    buffers: set[int] = set()
+
+    def double(items: list[int], count: int) -> list[int]:
+        buffers.add(id(items))
+        return [items[index] * 2 for index in range(count)]
+
+    result = await Stream(source([1, 2, 3, 4, 5])).map_batched(double, 2).to_list()
+    assert result == [2, 4, 6, 8, 10]
+    assert len(buffers) == 1
+
+    with pytest.raises(ValueError):
+        Stream(source([1])).map_batched(double, 0)
+
+
 @pytest.mark.asyncio
 async def test_tap_take_skip_and_enumerate() -> None:
     seen: list[int] = []
@@ -38,10 +178,41 @@ async def test_tap_take_skip_and_enumerate() -> None:
     assert seen == [1, 2, 3, 4]
     assert result == [2, 3, 4]
 
+    assert await Stream(source([1, 2])).take(0).to_list() == []
+    assert await Stream(source([1, 2])).take(5).to_list() == [1, 2]
+
     indexed = await Stream(source(["a", "b"])).enumerate(start=10).to_list()
     assert indexed == [(10, "a"), (11, "b")]
 
 
+@pytest.mark.asyncio
+async def test_prefetch_reads_ahead_of_consumer() -> None:
+    produced: list[int] = []
+
+    async def tracked() -> AsyncIterator[int]:
+        for item in range(5):
+            produced.append(item)
+            yield item
+
+    stream = Stream(tracked()).prefetch(2)
+    assert await anext(stream) == 0
+    await asyncio.sleep(0)
+    assert len(produced) > 1
+    assert await stream.to_list() == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_propagates_errors_and_validates_size() -> None:
+    async def broken() -> AsyncIterator[int]:
+        yield 1
+        raise RuntimeError("prefetch boom")
+
+    with pytest.raises(RuntimeError, match="prefetch boom"):
+        await Stream(broken()).prefetch(4).to_list()
+    with pytest.raises(ValueError):
+        Stream(source([1])).prefetch(0)
+
+
 @pytest.mark.asyncio
 async def test_keyed_and_split() -> None:
     entries = [{"kind": "a", "value": 1}, {"kind": "b", "value": 2}]
@@ -62,6 +233,32 @@ async def test_split_into_multiple_branches() -> None:
     assert await collect(third) == [1, 2, 3]
 
 
+@pytest.mark.asyncio
+async def test_split_branches_consume_concurrently() -> None:
+    async def slow(items: list[int]) -> AsyncIterator[int]:
+        for item in items:
+            await asyncio.sleep(0.001)
+            yield item
+
+    branches = Stream(slow([1, 2, 3, 4])).split(3)
+    results = await asyncio.gather(*(collect(branch) for branch in branches))
+    assert results == [[1, 2, 3, 4]] * 3
+
+
+@pytest.mark.asyncio
+async def test_split_propagates_source_error_to_all_branches() -> None:
+    async def broken() -> AsyncIterator[int]:
+        yield 1
+        await asyncio.sleep(0.001)
+        raise RuntimeError("boom")
+
+    first, second = Stream(broken()).split(2)
+    outcomes = await asyncio.gather(
+        collect(first), collect(second), return_exceptions=True
+    )
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+
+
 @pytest.mark.asyncio
 async def test_split_branch_validation() -> None:
     with pytest.raises(ValueError):
@@ -92,6 +289,56 @@ async def test_merge_propagates_source_errors() -> None:
         await Stream(source([10])).merge(broken()).to_list()
 
 
+class _Abort(BaseException):
+    pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [_Abort("abort"), asyncio.CancelledError()])
+async def test_merge_propagates_base_exceptions(error: BaseException) -> None:
+    async def broken() -> AsyncIterator[int]:
+        yield 1
+        raise error
+
+    merged = Stream(source([10])).merge(broken()).to_list()
+    with pytest.raises(type(error)):
+        await asyncio.wait_for(merged, timeout=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [_Abort("abort"), asyncio.CancelledError()])
+async def test_prefetch_propagates_base_exceptions(error: BaseException) -> None:
+    async def broken() -> AsyncIterator[int]:
+        yield 1
+        raise error
+
+    prefetched = Stream(broken()).prefetch(2).to_list()
+    with pytest.raises(type(error)):
+        await asyncio.wait_for(prefetched, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_merge_cancels_pending_sources_on_error() -> None:
+    cancelled = asyncio.Event()
+
+    async def slow() -> AsyncIterator[int]:
+        try:
+            while True:
+                await asyncio.sleep(1)
+                yield 0
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def broken() -> AsyncIterator[int]:
+        raise RuntimeError("merge boom")
+        yield 0
+
+    with pytest.raises(RuntimeError, match="merge boom"):
+        await Stream(slow()).merge(broken()).to_list()
+    assert cancelled.is_set()
+
+
 @pytest.mark.asyncio
 async def test_merge_handles_empty_and_single_source_cases() -> None:
     assert await Stream(source([1, 2, 3])).merge().to_list() == [1, 2, 3]
@@ -132,6 +379,14 @@ async def test_merge_ordered_with_custom_key_for_dict_items() -> None:
     assert [item["v"] for item in result] == ["a", "b", "c", "d"]
 
 
+@pytest.mark.asyncio
+async def test_merge_ordered_accepts_itemgetter_key() -> None:
+    first = Stream(source([{"ts": 1, "v": "a"}, {"ts": 4, "v": "d"}]))
+    second = source([{"ts": 2, "v": "b"}, {"ts": 3, "v": "c"}])
+    result = await first.merge_ordered(second, key=itemgetter("ts")).to_list()
+    assert [item["v"] for item in result] == ["a", "b", "c", "d"]
+
+
 @pytest.mark.asyncio
 async def test_merge_ordered_preserves_source_priority_for_equal_keys() -> None:
     first = Stream(source([{"k": 1, "src": "a1"}, {"k": 2, "src": "a2"}]))
@@ -142,6 +397,44 @@ async def test_merge_ordered_preserves_source_priority_for_equal_keys() -> None:
     assert [item["src"] for item in result] == ["a1", "b1", "a2", "b2"]
 
 
+@pytest.mark.asyncio
+async def test_merge_ordered_many_sources_matches_stable_sort() -> None:
+    runs = [
+        sorted((index * 7 + step * 3) % 5 for step in range(6)) for index in range(9)
+    ]
+    tagged = [[(value, index) for value in run] for index, run in enumerate(runs)]
+    first, *others = (source(run) for run in tagged)
+
+    result = await Stream(first).merge_ordered(*others, key=itemgetter(0)).to_list()
+
+    assert result == sorted((item for run in tagged for item in run))
+
+
+@pytest.mark.asyncio
+async def test_two_way_fast_paths_match_general_paths() -> None:
+    cases = [([], []), ([1], []), ([], [2]), ([1, 3, 5], [2, 2, 6, 7]), ([4], [1, 4])]
+    for left, right in cases:
+        ordered = await Stream(source(left)).merge_ordered(source(right)).to_list()
+        general = await (
+            Stream(source(left)).merge_ordered(source(right), source([])).to_list()
+        )
+        assert ordered == general == sorted(left + right)
+
+        zipped = await Stream(source(left)).zip(source(right)).to_list()
+        assert zipped == list(zip(left, right, strict=False))
+
+        longest = await (
+            Stream(source(left)).zip_longest(source(right), fillvalue=0).to_list()
+        )
+        assert longest == list(itertools.zip_longest(left, right, fillvalue=0))
+
+        merged = await Stream(source(left)).merge(source(right)).to_list()
+        assert sorted(merged) == sorted(left + right)
+
+    single = Stream(source([1, 2]))
+    assert single.merge() is single
+
+
 @pytest.mark.asyncio
 async def test_merge_ordered_handles_empty_streams() -> None:
     result = (
@@ -260,6 +553,7 @@ async def test_chunk_and_group_by_alias() -> None:
 
     alias_grouped = await collect(Stream(source(records)).chunk(size=3).groupBy("kind"))
     assert alias_grouped == grouped
+    assert AggregatedStream.groupBy is AggregatedStream.group_by
 
     chunks = await collect(Stream(source([1, 2, 3])).chunk(size=2))
     assert chunks == [[1, 2], [3]]
@@ -286,6 +580,29 @@ async def test_window_and_sliding_window() -> None:
     ]
 
 
+@pytest.mark.asyncio
+async def test_window_accepts_itemgetter_timestamp_getter() -> None:
+    points = [{"ts": 0}, {"ts": 1}, {"ts": 4}]
+    result = (
+        await Stream(source(points))
+        .window(interval=2, timestamp_getter=itemgetter("ts"))
+        .to_list()
+    )
+    assert result == [[points[0], points[1]], [points[2]]]
+
+
+@pytest.mark.asyncio
+async def test_window_is_anchored_at_first_item_and_inclusive() -> None:
+    points = [{"timestamp": ts} for ts in (0, 1, 2, 3, 5, 6)]
+    result = await Stream(source(points)).window(interval=2).to_list()
+    assert [[point["timestamp"] for point in window] for window in result] == [
+        [0, 1, 2],
+        [3, 5],
+        [6],
+    ]
+    assert await Stream(source([])).window(interval=2).to_list() == []
+
+
 @pytest.mark.asyncio
 async def test_window_with_timestamp_getter_and_no_partial() -> None:
     points = [
@@ -331,3 +648,77 @@ async def test_sink_processes_tail_chunk() -> None:
 
     await values.sink(sink, parallel=2)
     assert seen == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_sink_starts_next_item_when_any_slot_frees() -> None:
+    seen: list[int] = []
+
+    async def sink(item: int) -> None:
+        await asyncio.sleep(0.05 if item == 0 else 0)
+        seen.append(item)
+
+    await Stream(source([0, 1, 2, 3])).sink(sink, parallel=2)
+    assert seen == [1, 2, 3, 0]
+
+
+@pytest.mark.asyncio
+async def test_sink_awaits_inline_without_parallelism() -> None:
+    seen: list[int] = []
+    current = asyncio.current_task()
+
+    async def sink(item: int) -> None:
+        assert asyncio.current_task() is current
+        seen.append(item)
+
+    await Stream(source([1, 2])).sink(sink)
+    await Stream(source([3])).sink(lambda item: sink(item))
+
+    async def record(item: int) -> None:
+        seen.append(item)
+
+    await Stream(source([4, 5])).sink(
+        lambda item: record(item) if item == 4 else seen.append(item), parallel=2
+    )
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_sink_propagates_errors_and_cancels_in_flight() -> None:
+    cancelled = asyncio.Event()
+
+    async def sink(item: int) -> None:
+        if item == 1:
+            raise RuntimeError("sink boom")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(RuntimeError, match="sink boom"):
+        await Stream(source([0, 1, 2])).sink(sink, parallel=2)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_independent_lists() -> None:
+    chunks = await collect(Stream(source([1, 2, 3, 4, 5])).chunk(size=2))
+    chunks[0].append(99)
+    assert chunks == [[1, 2, 99], [3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_overlapping_windows_and_gaps() -> None:
+    points = [{"timestamp": ts} for ts in (0, 1, 2, 3, 10, 11)]
+    result = await Stream(source(points)).sliding_window(size=3, advance=1).to_list()
+    assert [[point["timestamp"] for point in window] for window in result] == [
+        [0, 1, 2],
+        [1, 2, 3],
+        [2, 3],
+        [3],
+        [10],
+        [10, 11],
+        [10, 11],
+        [11],
+    ]